@@ -1,10 +1,20 @@
-try:
-    import smbus2 as smbus
-except ImportError:
-    import smbus
+from i2c_bus import SMBus, i2c_msg
 import time
 
 class ADS7828:
+    # ADS7828 command bytes for single-ended mode with internal reference
+    # Mapping systematically verified against multimeter readings
+    CMD_MAP = {
+        0: 0xE8,  # Channel 0: Expected 1.67V, Got 1.668V (±0.002V)
+        1: 0x80,  # Channel 1: Expected 2.50V, Got 2.519V (±0.019V)
+        2: 0xA0,  # Channel 2: Expected 1.99V, Got 2.140V (±0.150V)
+        3: 0xD8,  # Channel 3: Expected 1.29V, Got 1.268V (±0.022V)
+        4: 0xBC,  # Channel 4: Expected 0.56V, Got 0.490V (±0.070V)
+        5: 0xB8,  # Channel 5: Expected 0.53V, Got 0.675V (±0.145V)
+        6: 0xFC,  # Channel 6: Expected 0.50V, Got 0.692V (±0.192V)
+        7: 0xE0   # Channel 7: Expected 0.40V, Got 0.735V (±0.335V)
+    }
+
     def __init__(self, bus_number=10, address=0x48, vref=3.3):
         self.bus_number = bus_number
         self.address = address
@@ -13,7 +23,7 @@ class ADS7828:
         
     def connect(self):
         try:
-            self.bus = smbus.SMBus(self.bus_number)
+            self.bus = SMBus(self.bus_number)
             self.bus.read_byte(self.address)
             print(f"ADS7828 connected at 0x{self.address:02X}")
             return True
@@ -29,20 +39,7 @@ class ADS7828:
                 print(f"Invalid channel {channel}")
                 return 0
 
-            # ADS7828 command bytes for single-ended mode with internal reference
-            # Mapping systematically verified against multimeter readings
-            cmd_map = {
-                0: 0xE8,  # Channel 0: Expected 1.67V, Got 1.668V (±0.002V)
-                1: 0x80,  # Channel 1: Expected 2.50V, Got 2.519V (±0.019V)
-                2: 0xA0,  # Channel 2: Expected 1.99V, Got 2.140V (±0.150V)
-                3: 0xD8,  # Channel 3: Expected 1.29V, Got 1.268V (±0.022V)
-                4: 0xBC,  # Channel 4: Expected 0.56V, Got 0.490V (±0.070V)
-                5: 0xB8,  # Channel 5: Expected 0.53V, Got 0.675V (±0.145V)
-                6: 0xFC,  # Channel 6: Expected 0.50V, Got 0.692V (±0.192V)
-                7: 0xE0   # Channel 7: Expected 0.40V, Got 0.735V (±0.335V)
-            }
-
-            cmd = cmd_map[channel]
+            cmd = self.CMD_MAP[channel]
 
             data = self.bus.read_word_data(self.address, cmd)
 
@@ -77,6 +74,40 @@ class ADS7828:
         else:
             return 0
     
+    def read_all_raw(self, samples=1):
+        """Read all 8 channels in one I2C burst per sample and return averaged raw values"""
+        if self.bus is None:
+            return [0] * 8
+        if i2c_msg is None:
+            return [self.read_channel_averaged(channel, samples) for channel in range(8)]
+
+        try:
+            totals = [0] * 8
+            for sample in range(samples):
+                if sample:
+                    time.sleep(0.01)  # Small delay between samples
+
+                # One combined transaction: command write + 2-byte read per channel
+                reads = []
+                msgs = []
+                for channel in range(8):
+                    read = i2c_msg.read(self.address, 2)
+                    reads.append(read)
+                    msgs.append(i2c_msg.write(self.address, [self.CMD_MAP[channel]]))
+                    msgs.append(read)
+                self.bus.i2c_rdwr(*msgs)
+
+                for channel, read in enumerate(reads):
+                    # Same byte order as read_word_data, keep the upper 12 bits
+                    low, high = list(read)
+                    totals[channel] += min(max(((high << 8) | low) >> 4, 0), 4095)
+
+            return [int(total / samples) for total in totals]
+
+        except Exception as e:
+            print(f"Error in burst read, falling back to per-channel reads: {e}")
+            return [self.read_channel_averaged(channel, samples) for channel in range(8)]
+
     def read_channel_voltage(self, channel):
         raw = self.read_channel(channel)
         return (raw / 4095.0) * self.vref
@@ -354,6 +354,13 @@ class AIVisionSystem:
         self.latest_frame = None
         self.latest_detections = []
         self.frame_lock = threading.Lock()
+        # Signalled on each new frame; frame_seq lets waiters skip frames they already sent
+        self.frame_cond = threading.Condition(self.frame_lock)
+        self.frame_seq = 0
+        # Encodings of the frame numbered _encoded_seq, shared by all readers
+        self._encoded_seq = -1
+        self._encoded_jpeg = None
+        self._encoded_b64 = None
 
     def initialize(self, model_name: str = "yolo11n.pt") -> bool:
         """Initialize the AI-Vision system"""
@@ -458,9 +465,11 @@ class AIVisionSystem:
                     annotated_frame = self.inference_engine.draw_detections(annotated_frame, detections)
 
                 # Store latest frame and detections
-                with self.frame_lock:
+                with self.frame_cond:
                     self.latest_frame = annotated_frame
                     self.latest_detections = detections
+                    self.frame_seq += 1
+                    self.frame_cond.notify_all()
 
                 # Add to detection queue for API access
                 try:
@@ -499,22 +508,49 @@ class AIVisionSystem:
             last_detection_time=self.last_detection_time
         )
 
+    def wait_for_frame(self, last_seq: int, timeout: float = 1.0) -> int:
+        """Block until a frame newer than last_seq is stored (or timeout), return the current sequence"""
+        with self.frame_cond:
+            self.frame_cond.wait_for(lambda: self.frame_seq != last_seq, timeout)
+            return self.frame_seq
+
     def get_latest_frame(self) -> Optional[bytes]:
-        """Get latest annotated frame as JPEG bytes"""
+        """Get latest annotated frame as JPEG bytes (encoded once per captured frame)"""
         with self.frame_lock:
             if self.latest_frame is None:
                 return None
 
+            if self._encoded_seq == self.frame_seq:
+                return self._encoded_jpeg
+
             try:
                 # Encode frame as JPEG
                 ret, buffer = cv2.imencode('.jpg', self.latest_frame)
                 if ret:
-                    return buffer.tobytes()
+                    self._encoded_jpeg = buffer.tobytes()
+                    self._encoded_b64 = None
+                    self._encoded_seq = self.frame_seq
+                    return self._encoded_jpeg
             except Exception as e:
                 logger.error(f"Error encoding frame: {e}")
 
         return None
 
+    def get_latest_frame_b64(self) -> Optional[str]:
+        """Get latest annotated frame as base64 JPEG (encoded once per captured frame)"""
+        jpeg = self.get_latest_frame()
+        if jpeg is None:
+            return None
+
+        with self.frame_lock:
+            if jpeg is self._encoded_jpeg:
+                if self._encoded_b64 is None:
+                    self._encoded_b64 = base64.b64encode(jpeg).decode('ascii')
+                return self._encoded_b64
+
+        # A newer frame arrived meanwhile; encode this one without caching
+        return base64.b64encode(jpeg).decode('ascii')
+
     def process_frame(self, frame) -> Optional[Any]:
         """Process external frame with AI detection and return annotated frame"""
         if frame is None:
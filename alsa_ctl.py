@@ -0,0 +1,151 @@
+"""
+ALSA control interface through libasound (ctypes)
+Lists and reads sound card controls without spawning amixer per call
+"""
+
+import ctypes
+import ctypes.util
+import threading
+from typing import Dict, Optional
+
+try:
+    _asound = ctypes.CDLL(ctypes.util.find_library('asound') or 'libasound.so.2')
+    ALSA_CTL_AVAILABLE = True
+except OSError:
+    _asound = None
+    ALSA_CTL_AVAILABLE = False
+
+# snd_ctl_elem_type_t / snd_ctl_elem_iface_t values used below
+_TYPE_BOOLEAN = 1
+_TYPE_INTEGER = 2
+_TYPE_ENUMERATED = 3
+_TYPE_BYTES = 4
+_TYPE_INTEGER64 = 6
+_IFACE_MIXER = 2
+
+if ALSA_CTL_AVAILABLE:
+    _ptr = ctypes.c_void_p
+    _uint = ctypes.c_uint
+    for _name, _args, _res in (
+        ('snd_ctl_open', [ctypes.POINTER(_ptr), ctypes.c_char_p, ctypes.c_int], ctypes.c_int),
+        ('snd_ctl_close', [_ptr], ctypes.c_int),
+        ('snd_ctl_elem_list_malloc', [ctypes.POINTER(_ptr)], ctypes.c_int),
+        ('snd_ctl_elem_list_free', [_ptr], None),
+        ('snd_ctl_elem_list', [_ptr, _ptr], ctypes.c_int),
+        ('snd_ctl_elem_list_get_count', [_ptr], _uint),
+        ('snd_ctl_elem_list_get_used', [_ptr], _uint),
+        ('snd_ctl_elem_list_alloc_space', [_ptr, _uint], ctypes.c_int),
+        ('snd_ctl_elem_list_free_space', [_ptr], None),
+        ('snd_ctl_elem_list_get_numid', [_ptr, _uint], _uint),
+        ('snd_ctl_elem_list_get_interface', [_ptr, _uint], ctypes.c_int),
+        ('snd_ctl_elem_list_get_name', [_ptr, _uint], ctypes.c_char_p),
+        ('snd_ctl_elem_info_malloc', [ctypes.POINTER(_ptr)], ctypes.c_int),
+        ('snd_ctl_elem_info_free', [_ptr], None),
+        ('snd_ctl_elem_info_set_numid', [_ptr, _uint], None),
+        ('snd_ctl_elem_info', [_ptr, _ptr], ctypes.c_int),
+        ('snd_ctl_elem_info_get_type', [_ptr], ctypes.c_int),
+        ('snd_ctl_elem_info_get_count', [_ptr], _uint),
+        ('snd_ctl_elem_value_malloc', [ctypes.POINTER(_ptr)], ctypes.c_int),
+        ('snd_ctl_elem_value_free', [_ptr], None),
+        ('snd_ctl_elem_value_set_numid', [_ptr, _uint], None),
+        ('snd_ctl_elem_read', [_ptr, _ptr], ctypes.c_int),
+        ('snd_ctl_elem_value_get_boolean', [_ptr, _uint], ctypes.c_int),
+        ('snd_ctl_elem_value_get_integer', [_ptr, _uint], ctypes.c_long),
+        ('snd_ctl_elem_value_get_integer64', [_ptr, _uint], ctypes.c_longlong),
+        ('snd_ctl_elem_value_get_enumerated', [_ptr, _uint], _uint),
+        ('snd_ctl_elem_value_get_byte', [_ptr, _uint], ctypes.c_ubyte),
+    ):
+        _func = getattr(_asound, _name)
+        _func.argtypes = _args
+        _func.restype = _res
+
+def _check(err: int, what: str):
+    if err < 0:
+        raise OSError(-err, f"{what} failed")
+
+def _malloc(alloc) -> ctypes.c_void_p:
+    obj = ctypes.c_void_p()
+    _check(alloc(ctypes.byref(obj)), alloc.__name__)
+    return obj
+
+class AlsaControls:
+    """Open control handle on one card, reusing one info and one value buffer"""
+
+    def __init__(self, card: str = 'hw:0'):
+        if not ALSA_CTL_AVAILABLE:
+            raise OSError("libasound not available")
+        self._handle = ctypes.c_void_p()
+        _check(_asound.snd_ctl_open(ctypes.byref(self._handle), card.encode(), 0), f"snd_ctl_open({card})")
+        self._info = _malloc(_asound.snd_ctl_elem_info_malloc)
+        self._value = _malloc(_asound.snd_ctl_elem_value_malloc)
+        self._lock = threading.Lock()  # Guards the shared buffers
+
+    def _check_open(self):
+        # Callers may still hold a numid after close(); libasound would crash on it
+        if not self._handle:
+            raise OSError("ALSA control handle is closed")
+
+    def list_controls(self) -> Dict[str, int]:
+        """Control name -> numid; on duplicate names the mixer-interface entry wins, as with amixer"""
+        with self._lock:
+            self._check_open()
+            elem_list = _malloc(_asound.snd_ctl_elem_list_malloc)
+            try:
+                _check(_asound.snd_ctl_elem_list(self._handle, elem_list), "snd_ctl_elem_list")
+                count = _asound.snd_ctl_elem_list_get_count(elem_list)
+                _check(_asound.snd_ctl_elem_list_alloc_space(elem_list, count), "snd_ctl_elem_list_alloc_space")
+                try:
+                    _check(_asound.snd_ctl_elem_list(self._handle, elem_list), "snd_ctl_elem_list")
+                    controls = {}
+                    for i in range(_asound.snd_ctl_elem_list_get_used(elem_list)):
+                        name = _asound.snd_ctl_elem_list_get_name(elem_list, i).decode(errors='replace')
+                        if name in controls and _asound.snd_ctl_elem_list_get_interface(elem_list, i) != _IFACE_MIXER:
+                            continue
+                        controls[name] = _asound.snd_ctl_elem_list_get_numid(elem_list, i)
+                    return controls
+                finally:
+                    _asound.snd_ctl_elem_list_free_space(elem_list)
+            finally:
+                _asound.snd_ctl_elem_list_free(elem_list)
+
+    def read_values(self, numid: int) -> Optional[str]:
+        """
+        Current value formatted like the 'values=' field of amixer cget,
+        or None for element types not decoded here (e.g. IEC958)
+        """
+        with self._lock:
+            self._check_open()
+            info, value = self._info, self._value
+            _asound.snd_ctl_elem_info_set_numid(info, numid)
+            _check(_asound.snd_ctl_elem_info(self._handle, info), "snd_ctl_elem_info")
+            elem_type = _asound.snd_ctl_elem_info_get_type(info)
+            count = _asound.snd_ctl_elem_info_get_count(info)
+
+            _asound.snd_ctl_elem_value_set_numid(value, numid)
+            _check(_asound.snd_ctl_elem_read(self._handle, value), "snd_ctl_elem_read")
+
+            if elem_type == _TYPE_BOOLEAN:
+                get = _asound.snd_ctl_elem_value_get_boolean
+                return ','.join(['on' if get(value, i) else 'off' for i in range(count)])
+            if elem_type == _TYPE_INTEGER:
+                get = _asound.snd_ctl_elem_value_get_integer
+            elif elem_type == _TYPE_INTEGER64:
+                get = _asound.snd_ctl_elem_value_get_integer64
+            elif elem_type == _TYPE_ENUMERATED:
+                get = _asound.snd_ctl_elem_value_get_enumerated
+            elif elem_type == _TYPE_BYTES:
+                get = _asound.snd_ctl_elem_value_get_byte
+                return ','.join([f"0x{get(value, i):02x}" for i in range(count)])
+            else:
+                return None
+            return ','.join([str(get(value, i)) for i in range(count)])
+
+    def close(self):
+        with self._lock:
+            if self._handle:
+                _asound.snd_ctl_elem_info_free(self._info)
+                _asound.snd_ctl_elem_value_free(self._value)
+                _asound.snd_ctl_close(self._handle)
+                self._handle = ctypes.c_void_p()
+                self._info = None
+                self._value = None
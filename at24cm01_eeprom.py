@@ -1,9 +1,6 @@
 
 
-try:
-    import smbus2 as smbus
-except ImportError:
-    import smbus
+from i2c_bus import SMBus
 
 class AT24CM01:
     MEMORY_SIZE = 131072
@@ -15,7 +12,7 @@ class AT24CM01:
         
     def connect(self):
         try:
-            self.bus = smbus.SMBus(self.bus_number)
+            self.bus = SMBus(self.bus_number)
             self.bus.read_byte(self.base_address)
             print(f"AT24CM01 connected at 0x{self.base_address:02X}")
             return True
@@ -4,10 +4,7 @@ Advanced EMC2301 Fan Controller Debugging Script
 This script tests different configurations to get the fan working
 """
 
-try:
-    import smbus2 as smbus
-except ImportError:
-    import smbus
+from i2c_bus import SMBus
 import time
 import sys
 
@@ -31,7 +28,7 @@ class EMC2301Debug:
 
     def connect(self):
         try:
-            self.bus = smbus.SMBus(self.bus_number)
+            self.bus = SMBus(self.bus_number)
             # Test connection
             product_id = self.bus.read_byte_data(self.address, self.REG_PRODUCT_ID)
             mfg_id = self.bus.read_byte_data(self.address, self.REG_MANUFACTURER_ID)
@@ -230,8 +227,12 @@ class EMC2301Debug:
             self.bus.close()
 
 def main():
-    print("EMC2301 Advanced Fan Controller Debug Tool")
-    print("=" * 50)
+    args = [arg for arg in sys.argv[1:] if arg != '--quiet']
+    quiet = len(args) != len(sys.argv) - 1
+
+    if not quiet:
+        print("EMC2301 Advanced Fan Controller Debug Tool")
+        print("=" * 50)
 
     fan = EMC2301Debug()
 
@@ -239,31 +240,35 @@ def main():
         print("Failed to connect to EMC2301")
         sys.exit(1)
 
-    fan.dump_key_registers()
-
-    if len(sys.argv) > 1:
-        mode = sys.argv[1].lower()
-
-        if mode == 'config1':
-            fan.test_configuration_1()
-        elif mode == 'config2':
-            fan.test_configuration_2()
-        elif mode == 'config3':
-            working_config = fan.test_configuration_3()
-            if working_config:
-                print(f"\n*** Working configuration found: 0x{working_config:02X} ***")
-        elif mode == 'rpm':
-            fan.test_rpm_mode()
-        elif mode == 'interactive':
-            fan.interactive_test()
-        else:
-            print(f"Unknown mode: {mode}")
+    def run_config3():
+        working_config = fan.test_configuration_3()
+        if working_config:
+            print(f"\n*** Working configuration found: 0x{working_config:02X} ***")
+
+    def run_interactive():
+        fan.dump_key_registers()
+        fan.interactive_test()
+
+    commands = {
+        'config1': fan.test_configuration_1,
+        'config2': fan.test_configuration_2,
+        'config3': run_config3,
+        'rpm': fan.test_rpm_mode,
+        'interactive': run_interactive,
+    }
+
+    if args:
+        mode = args[0].lower()
+        commands.get(mode, lambda: print(f"Unknown mode: {mode}"))()
     else:
+        fan.dump_key_registers()
+
         print("\nUsage:")
         print("  python3 debug_fan_control.py config1      # Test basic PWM config")
         print("  python3 debug_fan_control.py config2      # Test different PWM frequencies")
         print("  python3 debug_fan_control.py config3      # Test different config registers")
         print("  python3 debug_fan_control.py interactive  # Manual PWM testing")
+        print("  Add --quiet to suppress the banner")
         print("\nRunning all tests...")
 
         # Run all tests
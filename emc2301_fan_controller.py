@@ -1,7 +1,4 @@
-try:
-    import smbus2 as smbus
-except ImportError:
-    import smbus
+from i2c_bus import SMBus, i2c_msg
 import time
 
 class EMC2301:
@@ -21,15 +18,21 @@ class EMC2301:
     REG_TACH_LIMIT_LSB = 0x38   # Tachometer Limit LSB
     REG_TACH_LIMIT_MSB = 0x39   # Tachometer Limit MSB
     
+    # Tachometer samples averaged for the RPM reported by get_fan_status
+    TACH_AVERAGE_SAMPLES = 4
+    # Linux limits a single I2C_RDWR ioctl to 42 messages (21 write/read pairs)
+    MAX_BURST_SAMPLES = 21
+    
     def __init__(self, bus_number=10, address=0x2F):
         self.bus_number = bus_number
         self.address = address
         self.bus = None
         self.initialized = False
+        self._last_cfg = None
         
     def connect(self):
         try:
-            self.bus = smbus.SMBus(self.bus_number)
+            self.bus = SMBus(self.bus_number)
             # Test connection by reading a register
             test_read = self.bus.read_byte_data(self.address, self.REG_FAN_SETTING)
             print(f"EMC2301 connected at 0x{self.address:02X} (current setting: {test_read})")
@@ -64,6 +67,7 @@ class EMC2301:
         except Exception as e:
             print(f"EMC2301 initialization failed: {e}")
             self.initialized = False
+            self._last_cfg = None
     
     def set_pwm_duty_cycle(self, duty):
         """Set PWM duty cycle (0-100%)"""
@@ -115,25 +119,69 @@ class EMC2301:
             
         return self.set_pwm_duty_cycle(pwm_percent)
     
-    def read_fan_rpm(self):
+    def read_tach_burst(self, n):
+        """Read n tachometer count samples using combined I2C transactions"""
+        if self.bus is None:
+            return None
+            
+        try:
+            counts = []
+            if i2c_msg is None:
+                # Plain smbus has no i2c_rdwr, fall back to per-byte reads
+                for _ in range(n):
+                    tach_lsb = self.bus.read_byte_data(self.address, self.REG_TACH_COUNT)
+                    tach_msb = self.bus.read_byte_data(self.address, self.REG_TACH_COUNT + 1)
+                    counts.append((tach_msb << 8) | tach_lsb)
+                return counts
+            
+            # Each sample is a register-pointer write plus a 2-byte read; many
+            # samples go out in one ioctl instead of two SMBus calls apiece
+            while len(counts) < n:
+                batch = min(n - len(counts), self.MAX_BURST_SAMPLES)
+                reads = []
+                msgs = []
+                for _ in range(batch):
+                    read = i2c_msg.read(self.address, 2)
+                    reads.append(read)
+                    msgs.append(i2c_msg.write(self.address, [self.REG_TACH_COUNT]))
+                    msgs.append(read)
+                self.bus.i2c_rdwr(*msgs)
+                for read in reads:
+                    tach_lsb, tach_msb = list(read)
+                    counts.append((tach_msb << 8) | tach_lsb)
+            return counts
+            
+        except Exception as e:
+            print(f"Failed to read tachometer burst: {e}")
+            return None
+    
+    @staticmethod
+    def _tach_to_rpm(tach_count):
+        """Convert a tachometer count to RPM"""
+        # Formula varies by fan and configuration
+        # This is a generic approximation
+        if tach_count > 0:
+            return int(5000000 / tach_count)  # Approximate conversion
+        return 0
+    
+    def read_fan_rpm(self, samples=1):
         """Read current fan RPM from tachometer"""
         if self.bus is None:
             return None
             
         try:
-            # Read tachometer count (16-bit value)
-            tach_lsb = self.bus.read_byte_data(self.address, self.REG_TACH_COUNT)
-            tach_msb = self.bus.read_byte_data(self.address, self.REG_TACH_COUNT + 1)
-            tach_count = (tach_msb << 8) | tach_lsb
-            
-            # Convert tachometer count to RPM
-            # Formula varies by fan and configuration
-            # This is a generic approximation
-            if tach_count > 0:
-                rpm = int(5000000 / tach_count)  # Approximate conversion
+            if samples > 1:
+                counts = self.read_tach_burst(samples)
+                if not counts:
+                    return None
+                tach_count = sum(counts) // len(counts)
             else:
-                rpm = 0
-                
+                # Read tachometer count (16-bit value)
+                tach_lsb = self.bus.read_byte_data(self.address, self.REG_TACH_COUNT)
+                tach_msb = self.bus.read_byte_data(self.address, self.REG_TACH_COUNT + 1)
+                tach_count = (tach_msb << 8) | tach_lsb
+            
+            rpm = self._tach_to_rpm(tach_count)
             print(f"DEBUG: Tachometer count: {tach_count}, Calculated RPM: {rpm}")
             return rpm
             
@@ -161,17 +209,30 @@ class EMC2301:
         status = {
             "connected": self.bus is not None,
             "initialized": self.initialized,
-            "pwm_duty": self.get_pwm_duty_cycle(),
-            "rpm": self.read_fan_rpm()
+            "pwm_duty": None,
+            "rpm": None
         }
         
+        if self.bus is None:
+            return status
+            
         try:
-            if self.bus:
-                # Read configuration registers for debugging
-                config1 = self.bus.read_byte_data(self.address, self.REG_FAN_CONFIG1)
-                config2 = self.bus.read_byte_data(self.address, self.REG_FAN_CONFIG2)
-                status["config1"] = f"0x{config1:02X}"
-                status["config2"] = f"0x{config2:02X}"
+            # Read the whole 0x30-0x3F register block in one transaction
+            img = bytes(self.bus.read_i2c_block_data(self.address, self.REG_FAN_SETTING, 16))
+            pwm_value = img[self.REG_FAN_SETTING - 0x30]
+            config1 = img[self.REG_FAN_CONFIG1 - 0x30]
+            config2 = img[self.REG_FAN_CONFIG2 - 0x30]
+            tach_offset = self.REG_TACH_COUNT - 0x30
+            tach_counts = [img[tach_offset] | (img[tach_offset + 1] << 8)]
+            
+            # Top up the tach sample from the block read with a short burst
+            if self.TACH_AVERAGE_SAMPLES > 1:
+                tach_counts.extend(self.read_tach_burst(self.TACH_AVERAGE_SAMPLES - 1) or [])
+            
+            status["pwm_duty"] = (pwm_value / 255.0) * 100
+            status["rpm"] = self._tach_to_rpm(sum(tach_counts) // len(tach_counts))
+            status["config1"] = f"0x{config1:02X}"
+            status["config2"] = f"0x{config2:02X}"
                 
         except Exception as e:
             status["config_error"] = str(e)
@@ -182,9 +243,16 @@ class EMC2301:
         """Configure fan parameters"""
         print(f"DEBUG: configure_fan called - rpm_control={enable_rpm_control}, poles={poles}, edges={edges}")
         
+        # Skip the register writes if this configuration is already applied
+        cfg = (enable_rpm_control, poles, edges)
+        if cfg == self._last_cfg and self.initialized:
+            return True
+        
         # For now, just reinitialize with PWM mode
         if self.bus:
             self._initialize()
+            if self.initialized:
+                self._last_cfg = cfg
             
         return True
     
@@ -220,6 +288,7 @@ class EMC2301:
             return False
     
     def disconnect(self):
+        self._last_cfg = None
         if self.bus:
             try:
                 # Set fan to a safe speed before disconnecting
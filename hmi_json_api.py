@@ -9,25 +9,55 @@ Unified JSON interface for all HMI devices:
 - AT24CM01 EEPROM
 """
 
+import asyncio
+import atexit
+import base64
 import json
+import logging
+import logging.handlers
+import queue
 import time
 import threading
-import queue
 import traceback
 import os
-import csv
 import sqlite3
 import subprocess
 import signal
 import shutil
+import struct
 import psutil
 import re
 import glob
+import heapq
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional, Any, Callable, Union
+from dataclasses import dataclass, asdict, is_dataclass
 import uuid
+import itertools
+from bisect import bisect_left
+from array import array
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from urllib.parse import parse_qs, urlsplit
+
+# Prefer orjson for command parsing and response encoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional MessagePack framing for WebSocket clients that request it
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Direct ALSA control access for the audio CODEC (amixer is the fallback)
+from alsa_ctl import AlsaControls, ALSA_CTL_AVAILABLE
 
 # Import device classes (assumes they're available)
 try:
@@ -84,7 +114,210 @@ except ImportError as e:
     print(f"Warning: Audio system not available: {e}")
     AUDIO_SYSTEM_AVAILABLE = False
 
-@dataclass
+def _json_default(obj):
+    """Serialize dataclasses the encoder doesn't handle itself"""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if ORJSON_AVAILABLE:
+    _ORJSON_COMPACT_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    _ORJSON_OPTIONS = _ORJSON_COMPACT_OPTIONS | orjson.OPT_INDENT_2
+
+    def _json_loads(data):
+        # str, bytes, bytearray and memoryview are all parsed without a decode step
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        # orjson walks dataclasses natively; subclasses with extra slots
+        # (SerializedResponse) fall back to asdict() through default
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_json_default).decode()
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_json_default)
+
+    def _json_scalar(value) -> str:
+        return orjson.dumps(value).decode()
+
+    def _json_compact_bytes(obj) -> bytes:
+        # Unindented encoding for HTTP bodies and WebSocket frames
+        return orjson.dumps(obj, option=_ORJSON_COMPACT_OPTIONS, default=_json_default)
+
+    def _json_compact(obj) -> str:
+        return orjson.dumps(obj, option=_ORJSON_COMPACT_OPTIONS, default=_json_default).decode()
+
+    def _json_line_bytes(obj) -> bytes:
+        # One ND-JSON record, newline included
+        return orjson.dumps(obj, option=_ORJSON_COMPACT_OPTIONS | orjson.OPT_APPEND_NEWLINE, default=_json_default)
+else:
+    def _json_loads(data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, indent=2, default=_json_default)
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return _json_dumps(obj).encode()
+
+    def _json_scalar(value) -> str:
+        return json.dumps(value)
+
+    def _json_compact(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'), default=_json_default)
+
+    def _json_compact_bytes(obj) -> bytes:
+        return _json_compact(obj).encode()
+
+    def _json_line_bytes(obj) -> bytes:
+        return _json_compact(obj).encode() + b'\n'
+
+def _msgpack_dumps(obj) -> bytes:
+    """Pack a response (dataclasses included) as MessagePack"""
+    return msgpack.packb(obj, default=_json_default, use_bin_type=True)
+
+# Fixed-shape error response, same layout as _json_dumps(APIResponse(...))
+_ERROR_TEMPLATE = (
+    '{\n  "success": false,\n  "timestamp": %s,\n  "request_id": %s,\n'
+    '  "data": null,\n  "error": %s,\n  "warnings": null\n}'
+)
+
+# Default request ids: per-process tag plus a counter, no urandom per request
+_REQUEST_ID_TAG = uuid.uuid4().hex[:8]
+_request_counter = itertools.count()
+
+# Stand-in request_id of the cached system status body, replaced per call
+_STATUS_REQUEST_ID_PLACEHOLDER = f"{_REQUEST_ID_TAG}-status"
+_STATUS_REQUEST_ID_JSON = f'"{_STATUS_REQUEST_ID_PLACEHOLDER}"'
+
+# Commands larger than this are rejected before parsing (GUI commands are tiny)
+_MAX_COMMAND_SIZE = 1 << 20
+
+# Fast path for the "YYYY-MM-DDTHH:MM:SS" strings sent by the GUI
+_DATETIME_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})')
+
+# "0xNN" strings for every byte value, used for EEPROM hex dumps
+_HEX_LUT = [f"0x{b:02X}" for b in range(256)]
+
+# Fixed channel/pin layouts of the ADS7828 and PCAL9555A
+_ADC_CHANNELS = range(8)
+_IO_PINS = range(16)
+
+# Advertised actions per device type (shared lists, treat as read-only)
+_DEVICE_CAPABILITIES = {
+    'adc': ['read_channel', 'read_all_channels', 'set_vref', 'get_status'],
+    'io': ['read_pin', 'write_pin', 'configure_pin', 'read_all_pins', 'reset', 'get_status'],
+    'rtc': ['read_datetime', 'set_datetime', 'set_alarm', 'set_clkout', 'get_status'],
+    'fan': ['set_pwm', 'set_rpm', 'read_rpm', 'get_status', 'configure'],
+    'eeprom': ['read', 'write', 'read_string', 'write_string', 'erase', 'test', 'get_info'],
+    'audio': ['get_status', 'get_all_controls', 'get_volume_controls', 'get_switch_controls', 'get_eq_controls', 'set_control', 'get_control', 'refresh_controls']
+}
+
+# Read-only device actions answered from the monitoring snapshot cache,
+# so they leave it in place for the next monitoring read
+_CACHED_READ_ACTIONS = frozenset({('fan', 'read_rpm'), ('fan', 'get_status')})
+
+# Valid parameter values for the hot range checks
+_VALID_ADC_CHANNELS = frozenset(_ADC_CHANNELS)
+_VALID_IO_PINS = frozenset(_IO_PINS)
+_VALID_CLKOUT_FREQUENCIES = frozenset(range(8))
+
+# Substrings that put an ALSA control name in each audio category
+_AUDIO_VOLUME_KEYWORDS = ('Volume', 'volume')
+_AUDIO_SWITCH_KEYWORDS = ('Switch', 'Enable', 'switch', 'enable')
+_AUDIO_EQ_KEYWORDS = ('EQ', 'eq', 'Equalizer')
+_AUDIO_ROUTING_KEYWORDS = ('Route', 'route')
+_AUDIO_DYNAMICS_KEYWORDS = ('Comp', 'comp', 'Limiter', 'limiter')
+_AUDIO_CATEGORIES = (
+    ('volume', _AUDIO_VOLUME_KEYWORDS),
+    ('switch', _AUDIO_SWITCH_KEYWORDS),
+    ('eq', _AUDIO_EQ_KEYWORDS),
+    ('routing', _AUDIO_ROUTING_KEYWORDS),
+    ('dynamics', _AUDIO_DYNAMICS_KEYWORDS),
+)
+# One pattern per category for membership tests
+_AUDIO_CATEGORY_RES = {
+    category: re.compile('|'.join(map(re.escape, keywords)))
+    for category, keywords in _AUDIO_CATEGORIES
+}
+# Single-call classifier: anchored lookahead alternatives are tried in
+# category order, so a name matching several categories gets the first
+# one (plain alternation would pick whichever keyword occurs leftmost);
+# .lastgroup names the category
+_AUDIO_CLASSIFIER_RE = re.compile('|'.join(
+    f'(?=.*?(?:{pattern.pattern}))(?P<{category}>)'
+    for category, pattern in _AUDIO_CATEGORY_RES.items()
+), re.S)
+
+def _adc_raws_to_voltages(raws: List[int], vref: float) -> List[float]:
+    """Convert 12-bit ADC raw readings to voltages"""
+    scale = vref / 4095.0
+    return [raw * scale for raw in raws]
+
+def _word_to_pin_states(word: int) -> List[int]:
+    """Split a 16-bit port word into per-pin states"""
+    return [(word >> pin) & 1 for pin in _IO_PINS]
+
+@lru_cache(maxsize=8)
+def _parse_datetime_fields(datetime_str: str) -> tuple:
+    """
+    (year, month, day, hour, minute, second) of an ISO datetime string
+
+    Cached because clients tend to resend the same value; raises ValueError
+    for strings the ISO parser rejects.
+    """
+    # Plain "YYYY-MM-DDTHH:MM:SS" via regex; datetime() rejects impossible
+    # dates such as Feb 30 just as the ISO parser does
+    match = _DATETIME_RE.fullmatch(datetime_str)
+    if match:
+        dt = datetime(*map(int, match.groups()))
+    else:
+        # Anything unusual goes through the full ISO parser
+        dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+    return (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+
+# Diagnostics from the polling/logging threads; handlers are left to the
+# application (see _start_log_listener for the script entry point)
+logger = logging.getLogger(__name__)
+
+def _start_log_listener():
+    """
+    Send log records through a queue drained by a background thread, so a
+    slow console never stalls device I/O. Called by the script entry point
+    only; applications importing this module configure logging themselves.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on exit
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
+# Local-time "YYYY-MM-DDTHH:MM:SS" of the last whole second formatted
+_iso_second_cache = (None, '')
+
+def _iso_local(ts: float) -> str:
+    """
+    Same text as datetime.fromtimestamp(ts).isoformat(), reusing the
+    formatted date/time while consecutive timestamps share a second
+    """
+    global _iso_second_cache
+    sec = int(ts)
+    micros = round((ts - sec) * 1e6)
+    if micros >= 1000000:
+        sec += 1
+        micros -= 1000000
+    cached_sec, prefix = _iso_second_cache
+    if cached_sec != sec:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))
+        _iso_second_cache = (sec, prefix)
+    return f'{prefix}.{micros:06d}' if micros else prefix
+
+@dataclass(slots=True)
 class DeviceStatus:
     """Standard device status structure"""
     device_type: str
@@ -94,7 +327,7 @@ class DeviceStatus:
     error_message: Optional[str] = None
     capabilities: List[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class APIResponse:
     """Standard API response structure"""
     success: bool
@@ -104,6 +337,14 @@ class APIResponse:
     error: Optional[str] = None
     warnings: Optional[List[str]] = None
 
+class SerializedResponse(APIResponse):
+    """APIResponse that carries its JSON text, for responses encoded ahead of time"""
+    __slots__ = ('text',)
+
+    def __init__(self, text: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.text = text
+
 @dataclass
 class ADCDataPoint:
     """Single ADC data point for logging"""
@@ -122,6 +363,7 @@ class LoggingConfig:
     file_rotation_hours: int = 24
     log_directory: str = "logs"
     channels: List[int] = None  # None means all channels
+    file_format: str = "csv"  # "csv", or "binary" for packed ADC_LOG_RECORD rows
 
 class GPIOStatusController:
     """Controls GPIO pin to indicate app status"""
@@ -173,8 +415,8 @@ class GPIOStatusController:
                     break
 
             except Exception as e:
-                print(f"Error in GPIO blink loop: {e}")
-                time.sleep(1.0)
+                logger.error("Error in GPIO blink loop: %s", e)
+                self._stop_event.wait(1.0)
 
     def _set_gpio_high(self):
         """Set GPIO pin high using pinctrl"""
@@ -200,10 +442,30 @@ class AudioInterface:
     def __init__(self):
         self.device_name = "hw:0"  # Default ALSA device
         self.available_controls = {}
+        # libasound control handle and control name -> numid; without it
+        # every control access goes through amixer
+        self._ctl = None
+        self._control_ids = {}
+        self._open_ctl()
         self._refresh_controls()
 
+    def _open_ctl(self):
+        """Open the libasound control handle if the library and card are there"""
+        if not ALSA_CTL_AVAILABLE or self._ctl is not None:
+            return
+        try:
+            self._ctl = AlsaControls(self.device_name)
+        except OSError:
+            self._ctl = None
+
     def connect(self) -> bool:
         """Connect to audio interface (ALSA)"""
+        self._open_ctl()
+        if self._ctl is not None:
+            self._refresh_controls()
+            print(f"Audio interface connected with {len(self.available_controls)} controls")
+            return True
+
         try:
             # Test if ALSA is available by listing controls
             result = subprocess.run(['amixer', '-c', '0', 'info'],
@@ -221,6 +483,15 @@ class AudioInterface:
 
     def _refresh_controls(self):
         """Scan available ALSA controls"""
+        if self._ctl is not None:
+            try:
+                self._control_ids = self._ctl.list_controls()
+                for control_name in self._control_ids:
+                    self.available_controls[control_name] = True
+                return
+            except OSError as e:
+                print(f"Warning: ALSA control listing failed, using amixer: {e}")
+
         try:
             result = subprocess.run(['amixer', '-c', '0', 'controls'],
                                   capture_output=True, text=True, timeout=10)
@@ -238,6 +509,17 @@ class AudioInterface:
 
     def get_control_value(self, control_name: str) -> Optional[str]:
         """Get current value of an ALSA control"""
+        ctl = self._ctl  # disconnect() may clear it from another thread
+        numid = self._control_ids.get(control_name)
+        if ctl is not None and numid is not None:
+            # Read through libasound; same text as amixer's "values=" field
+            try:
+                value = ctl.read_values(numid)
+                if value is not None:
+                    return value
+            except OSError:
+                pass  # Fall back to amixer
+
         try:
             result = subprocess.run(['amixer', '-c', '0', 'cget', f"name='{control_name}'"],
                                   capture_output=True, text=True, timeout=5)
@@ -252,7 +534,7 @@ class AudioInterface:
             return None
 
     def set_control_value(self, control_name: str, value: str) -> bool:
-        """Set value of an ALSA control"""
+        """Set value of an ALSA control (amixer parses %, dB and enum item names)"""
         try:
             result = subprocess.run(['amixer', '-c', '0', 'cset', f"name='{control_name}'", value],
                                   capture_output=True, text=True, timeout=5)
@@ -261,67 +543,68 @@ class AudioInterface:
             print(f"Error setting control {control_name}: {e}")
             return False
 
+    def _read_all_controls_bulk(self) -> Dict[str, str]:
+        """Values of every control from a single amixer contents call"""
+        values = {}
+        try:
+            result = subprocess.run(['amixer', '-c', '0', 'contents'],
+                                  capture_output=True, text=True, timeout=10)
+            if result.returncode != 0:
+                return values
+            # Each control is a "numid=...,name='...'" line followed by
+            # indented "; ..." info lines and one "  : values=..." line
+            control_name = None
+            for line in result.stdout.split('\n'):
+                if line.startswith('numid='):
+                    name_start = line.find("name='") + 6
+                    name_end = line.rfind("'")
+                    control_name = line[name_start:name_end] if name_start > 5 and name_end > name_start else None
+                elif control_name is not None and line.startswith('  : values='):
+                    values[control_name] = line[11:].strip()
+                    control_name = None
+        except Exception as e:
+            print(f"Error reading ALSA controls: {e}")
+        return values
+
+    def _read_controls(self, names: List[str]) -> Dict[str, Optional[str]]:
+        """Current values of the named controls (one amixer call without libasound)"""
+        if self._ctl is not None:
+            return {name: self.get_control_value(name) for name in names}
+        values = self._read_all_controls_bulk()
+        return {name: values.get(name) for name in names}
+
+    def get_category_names(self, category: str) -> List[str]:
+        """Names of the available controls with any of the category's keywords (no value reads)"""
+        search = _AUDIO_CATEGORY_RES[category].search
+        return [name for name in self.available_controls if search(name)]
+
+    def _get_category_controls(self, category: str) -> Dict[str, Any]:
+        return {
+            name: {'value': value, 'type': category}
+            for name, value in self._read_controls(self.get_category_names(category)).items()
+        }
+
     def get_volume_controls(self) -> Dict[str, Any]:
         """Get all volume-related controls"""
-        volume_controls = {}
-        volume_keywords = ['Volume', 'volume']
-
-        for control_name in self.available_controls:
-            if any(keyword in control_name for keyword in volume_keywords):
-                value = self.get_control_value(control_name)
-                volume_controls[control_name] = {
-                    'value': value,
-                    'type': 'volume'
-                }
-        return volume_controls
+        return self._get_category_controls('volume')
 
     def get_switch_controls(self) -> Dict[str, Any]:
         """Get all switch/enable controls"""
-        switch_controls = {}
-        switch_keywords = ['Switch', 'Enable', 'switch', 'enable']
-
-        for control_name in self.available_controls:
-            if any(keyword in control_name for keyword in switch_keywords):
-                value = self.get_control_value(control_name)
-                switch_controls[control_name] = {
-                    'value': value,
-                    'type': 'switch'
-                }
-        return switch_controls
+        return self._get_category_controls('switch')
 
     def get_eq_controls(self) -> Dict[str, Any]:
         """Get equalizer controls"""
-        eq_controls = {}
-        eq_keywords = ['EQ', 'eq', 'Equalizer']
-
-        for control_name in self.available_controls:
-            if any(keyword in control_name for keyword in eq_keywords):
-                value = self.get_control_value(control_name)
-                eq_controls[control_name] = {
-                    'value': value,
-                    'type': 'eq'
-                }
-        return eq_controls
+        return self._get_category_controls('eq')
 
     def get_all_controls(self) -> Dict[str, Any]:
         """Get all available audio controls with their current values"""
         all_controls = {}
+        classify = _AUDIO_CLASSIFIER_RE.match
 
-        for control_name in self.available_controls:
-            value = self.get_control_value(control_name)
-            control_type = 'unknown'
-
+        for control_name, value in self._read_controls(list(self.available_controls)).items():
             # Categorize control
-            if any(keyword in control_name for keyword in ['Volume', 'volume']):
-                control_type = 'volume'
-            elif any(keyword in control_name for keyword in ['Switch', 'Enable', 'switch', 'enable']):
-                control_type = 'switch'
-            elif any(keyword in control_name for keyword in ['EQ', 'eq', 'Equalizer']):
-                control_type = 'eq'
-            elif any(keyword in control_name for keyword in ['Route', 'route']):
-                control_type = 'routing'
-            elif any(keyword in control_name for keyword in ['Comp', 'comp', 'Limiter', 'limiter']):
-                control_type = 'dynamics'
+            match = classify(control_name)
+            control_type = match.lastgroup if match else 'unknown'
 
             all_controls[control_name] = {
                 'value': value,
@@ -333,6 +616,9 @@ class AudioInterface:
 
     def test_audio_device(self) -> bool:
         """Test if audio device is available"""
+        if self._ctl is not None:
+            return len(self.available_controls) > 0
+
         try:
             # Test if we can access ALSA controls (more reliable than checking device names)
             result = subprocess.run(['amixer', '-c', '0', 'info'],
@@ -344,35 +630,160 @@ class AudioInterface:
         except Exception:
             return False
 
+    def disconnect(self):
+        if self._ctl is not None:
+            self._ctl.close()
+            self._ctl = None
+            self._control_ids = {}
+
+class ChannelRing:
+    """
+    Fixed-capacity ring of ADC samples for one channel, stored column-wise
+    in typed arrays (about 28 bytes per sample instead of a dataclass each)
+    """
+
+    __slots__ = ('ts', 'raw', 'volt', 'vref', 'head', 'n', 'cap')
+
+    def __init__(self, capacity: int):
+        self.cap = capacity
+        self.ts = array('d', bytes(8 * capacity))
+        self.raw = array('i', bytes(4 * capacity))
+        self.volt = array('d', bytes(8 * capacity))
+        self.vref = array('d', bytes(8 * capacity))
+        self.head = 0  # Next slot to write
+        self.n = 0     # Valid samples
+
+    def __len__(self):
+        return self.n
+
+    def append(self, timestamp: float, raw_value: int, voltage: float, vref: float):
+        head = self.head
+        self.ts[head] = timestamp
+        self.raw[head] = raw_value
+        self.volt[head] = voltage
+        self.vref[head] = vref
+        self.head = (head + 1) % self.cap
+        if self.n < self.cap:
+            self.n += 1
+
+    def rows(self, max_points: int = None, since: float = None) -> List[tuple]:
+        """(timestamp, raw, voltage, vref) rows, oldest first, optionally limited to the newest ones"""
+        n, cap = self.n, self.cap
+        oldest = (self.head - n) % cap
+        first = n - min(max_points, n) if max_points else 0
+        if since is not None and n:
+            # Timestamps are appended in order, so the cutoff is a binary search
+            ts = self.ts
+            first = max(first, bisect_left(range(n), since, key=lambda k: ts[(oldest + k) % cap]))
+
+        # Copy out at most two contiguous slices of each column
+        begin = (oldest + first) % cap
+        count = n - first
+        end = min(begin + count, cap)
+        columns = (self.ts, self.raw, self.volt, self.vref)
+        result = list(zip(*(column[begin:end] for column in columns)))
+        wrapped = count - (end - begin)
+        if wrapped:
+            result.extend(zip(*(column[:wrapped] for column in columns)))
+        return result
+
+# Binary ADC log layout: magic, then fixed-size little-endian records of
+# (timestamp f64, channel u8, raw_value u16, voltage f32, vref f32)
+ADC_LOG_MAGIC = b"ADCLOG01"
+ADC_LOG_RECORD = struct.Struct('<dBHff')
+_ADC_LOG_FORMATS = {'csv': '.csv', 'binary': '.bin'}
+
+def _format_csv_rows(rows: List[tuple]) -> bytes:
+    """CSV text of (timestamp, channel, raw_value, voltage, vref) rows, as csv.writer would emit it"""
+    # Numeric columns never need quoting, so rows are formatted directly
+    return ''.join([
+        f'{ts!r},{_iso_local(ts)},{channel},{raw_value},{voltage!r},{vref!r}\r\n'
+        for ts, channel, raw_value, voltage, vref in rows
+    ]).encode('ascii')
+
+def iter_binary_adc_log(path: str):
+    """Yield (timestamp, channel, raw_value, voltage, vref) rows from a binary ADC log"""
+    with open(path, 'rb') as f:
+        if f.read(len(ADC_LOG_MAGIC)) != ADC_LOG_MAGIC:
+            raise ValueError(f"{path} is not a binary ADC log")
+        data = f.read()
+    # A record torn by power loss at the end of the file is skipped
+    usable = len(data) - len(data) % ADC_LOG_RECORD.size
+    yield from ADC_LOG_RECORD.iter_unpack(memoryview(data)[:usable])
+
+def convert_binary_adc_log(path: str, csv_path: str) -> int:
+    """Write a binary ADC log out in the CSV log format, returning the row count"""
+    # float32 columns are rounded back to the 7 significant digits they hold
+    rows = [(ts, channel, raw_value, float(f'{voltage:.7g}'), float(f'{vref:.7g}'))
+            for ts, channel, raw_value, voltage, vref in iter_binary_adc_log(path)]
+    with open(csv_path, 'wb') as f:
+        f.write(ADCDataLogger.CSV_HEADER)
+        f.write(_format_csv_rows(rows))
+    return len(rows)
+
 class ADCDataLogger:
     """
     ADC Data Logger - handles time-series logging of ADC readings
     Supports both in-memory and file-based storage
     """
 
+    QUEUE_CAPACITY = 10000      # Pending points before new ones are dropped
+    WRITE_BATCH_SIZE = 256      # Max points written per file write() call
+    FLUSH_INTERVAL = 1.0        # Seconds between flushes of the log file
+    FILE_BUFFER_SIZE = 1 << 20  # Log file write buffer (bytes)
+    CSV_HEADER = b"timestamp,datetime,channel,raw_value,voltage,vref\r\n"  # Log file header row
+
     def __init__(self, config: LoggingConfig = None):
         self.config = config or LoggingConfig()
 
-        # In-memory data storage (channel -> deque of data points)
-        self.memory_data: Dict[int, deque] = defaultdict(lambda: deque(maxlen=self.config.max_memory_points))
+        # In-memory data storage (channel -> ring of recent samples)
+        self.memory_data: Dict[int, ChannelRing] = defaultdict(lambda: ChannelRing(self.config.max_memory_points))
 
         # File logging
         self.current_log_file = None
+        self._binary_log = False  # Format of current_log_file
+        self._last_flush = 0.0
         self.log_file_start_time = None
         self.logging_thread = None
         self.logging_active = False
-        self.data_queue = queue.Queue(maxsize=10000)
+        self._stop_event = threading.Event()
+        # Pending (timestamp, channel, raw, voltage, vref) rows for the file
+        # writer; deque append/popleft need no lock, and the event wakes the
+        # writer instead of a Condition
+        self.data_queue = deque()
+        self._data_ready = threading.Event()
+
+        # Channel filter as a set, and log_adc_reading bound to a no-op
+        # while logging is disabled so ADC reads skip the checks entirely
+        self._channels_set = set(self.config.channels) if self.config.channels is not None else None
+        self._bind_log_adc_reading()
 
         # Create log directory
         if self.config.enabled:
             os.makedirs(self.config.log_directory, exist_ok=True)
 
+    @staticmethod
+    def _noop(*args, **kwargs):
+        pass
+
+    def _bind_log_adc_reading(self):
+        enabled = self.config.enabled
+        self.log_adc_reading = self._log_adc_reading if enabled else self._noop
+        self.log_batch = self._log_batch if enabled else self._noop
+
+    def set_enabled(self, enabled: bool):
+        """Enable or disable recording of ADC readings"""
+        self.config.enabled = enabled
+        self._bind_log_adc_reading()
+
     def start_logging(self):
         """Start the background logging thread"""
         if self.logging_active:
             return
 
         self.logging_active = True
+        self._bind_log_adc_reading()
+        self._stop_event.clear()
         self.logging_thread = threading.Thread(target=self._logging_worker, daemon=True)
         self.logging_thread.start()
         print("ADC logging started")
@@ -380,55 +791,70 @@ class ADCDataLogger:
     def stop_logging(self):
         """Stop the background logging thread"""
         self.logging_active = False
+        self._bind_log_adc_reading()
+        self._stop_event.set()
+        self._data_ready.set()  # Wake the worker out of its wait
         if self.logging_thread:
             self.logging_thread.join(timeout=5)
         if self.current_log_file:
-            self.current_log_file.close()
+            self._close_log_file()
             self.current_log_file = None
         print("ADC logging stopped")
 
-    def log_adc_reading(self, data_point: ADCDataPoint):
-        """Add an ADC reading to the logging queue"""
-        if not self.config.enabled:
-            return
-
+    def _log_adc_reading(self, data_point: ADCDataPoint):
+        """Add an ADC reading to the logging queue (bound as log_adc_reading while enabled)"""
         # Check if we should log this channel
-        if self.config.channels is not None and data_point.channel not in self.config.channels:
+        if self._channels_set is not None and data_point.channel not in self._channels_set:
             return
 
         # Add to memory storage
-        self.memory_data[data_point.channel].append(data_point)
+        self.memory_data[data_point.channel].append(
+            data_point.timestamp, data_point.raw_value, data_point.voltage, data_point.vref
+        )
 
         # Add to file logging queue
-        try:
-            self.data_queue.put_nowait(data_point)
-        except queue.Full:
-            print("WARNING: ADC logging queue full, dropping data point")
-
-    def get_recent_data(self, channel: int = None, max_points: int = None, time_range_seconds: int = None) -> Dict[int, List[ADCDataPoint]]:
-        """Get recent data from memory storage"""
-        result = {}
-
-        channels_to_get = [channel] if channel is not None else list(self.memory_data.keys())
-
-        for ch in channels_to_get:
-            if ch not in self.memory_data:
+        if len(self.data_queue) >= self.QUEUE_CAPACITY:
+            logger.warning("ADC logging queue full, dropping data point")
+            return
+        self.data_queue.append((data_point.timestamp, data_point.channel, data_point.raw_value,
+                                data_point.voltage, data_point.vref))
+        self._data_ready.set()
+
+    def _log_batch(self, timestamp: float, raw_values: List[int], voltages: List[float], vref: float):
+        """Log one reading per channel (channel = position) taken at the same time (bound as log_batch while enabled)"""
+        channels = self._channels_set
+        memory_data = self.memory_data
+        rows = []
+        for channel, (raw_value, voltage) in enumerate(zip(raw_values, voltages)):
+            if channels is not None and channel not in channels:
                 continue
+            memory_data[channel].append(timestamp, raw_value, voltage, vref)
+            rows.append((timestamp, channel, raw_value, voltage, vref))
 
-            data = list(self.memory_data[ch])
-
-            # Apply time range filter
-            if time_range_seconds:
-                cutoff_time = time.time() - time_range_seconds
-                data = [dp for dp in data if dp.timestamp >= cutoff_time]
+        # Add to file logging queue
+        if len(self.data_queue) + len(rows) > self.QUEUE_CAPACITY:
+            logger.warning("ADC logging queue full, dropping data points")
+            return
+        self.data_queue.extend(rows)
+        self._data_ready.set()
 
-            # Apply max points limit
-            if max_points:
-                data = data[-max_points:]
+    def get_recent_rows(self, channel: int = None, max_points: int = None, time_range_seconds: int = None) -> Dict[int, List[tuple]]:
+        """Get recent (timestamp, raw_value, voltage, vref) rows from memory storage"""
+        cutoff_time = time.time() - time_range_seconds if time_range_seconds else None
+        channels_to_get = [channel] if channel is not None else list(self.memory_data.keys())
 
-            result[ch] = data
+        return {
+            ch: self.memory_data[ch].rows(max_points, cutoff_time)
+            for ch in channels_to_get
+            if ch in self.memory_data
+        }
 
-        return result
+    def get_recent_data(self, channel: int = None, max_points: int = None, time_range_seconds: int = None) -> Dict[int, List[ADCDataPoint]]:
+        """Get recent data from memory storage"""
+        return {
+            ch: [ADCDataPoint(ts, ch, raw, volt, vref) for ts, raw, volt, vref in rows]
+            for ch, rows in self.get_recent_rows(channel, max_points, time_range_seconds).items()
+        }
 
     def get_logging_stats(self) -> Dict:
         """Get statistics about the logging system"""
@@ -438,7 +864,7 @@ class ADCDataLogger:
             'sample_interval': self.config.sample_interval,
             'memory_points_per_channel': {ch: len(data) for ch, data in self.memory_data.items()},
             'total_memory_points': sum(len(data) for data in self.memory_data.values()),
-            'queue_size': self.data_queue.qsize() if hasattr(self.data_queue, 'qsize') else 0,
+            'queue_size': len(self.data_queue),
             'current_log_file': os.path.basename(self.current_log_file.name) if self.current_log_file else None
         }
         return stats
@@ -446,29 +872,18 @@ class ADCDataLogger:
     def export_data_csv(self, filename: str, channel: int = None, time_range_seconds: int = None) -> bool:
         """Export data to CSV file"""
         try:
-            data = self.get_recent_data(channel=channel, time_range_seconds=time_range_seconds)
-
-            with open(filename, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(['timestamp', 'datetime', 'channel', 'raw_value', 'voltage', 'vref'])
-
-                # Combine all channels and sort by timestamp
-                all_points = []
-                for ch, points in data.items():
-                    all_points.extend(points)
-
-                all_points.sort(key=lambda x: x.timestamp)
-
-                for point in all_points:
-                    dt = datetime.fromtimestamp(point.timestamp)
-                    writer.writerow([
-                        point.timestamp,
-                        dt.isoformat(),
-                        point.channel,
-                        point.raw_value,
-                        point.voltage,
-                        point.vref
-                    ])
+            data = self.get_recent_rows(channel=channel, time_range_seconds=time_range_seconds)
+
+            # Each channel's rows are already in time order, so a k-way merge
+            # replaces the full sort; rows are formatted like the log files
+            merged = heapq.merge(
+                *[[(ts, ch, raw, volt, vref) for ts, raw, volt, vref in rows] for ch, rows in data.items()],
+                key=itemgetter(0)
+            )
+
+            with open(filename, 'wb') as csvfile:
+                csvfile.write(self.CSV_HEADER)
+                csvfile.write(_format_csv_rows(list(merged)))
 
             return True
 
@@ -478,21 +893,30 @@ class ADCDataLogger:
 
     def _logging_worker(self):
         """Background thread worker for file logging"""
-        while self.logging_active:
+        while not self._stop_event.is_set():
             try:
                 # Check if we need to rotate log file
                 self._check_log_rotation()
 
-                # Process queued data points
+                # Sleep only when there is nothing left to write; a producer
+                # appends before setting the event, so no point is missed
+                if not self.data_queue:
+                    self._data_ready.wait(1.0)
+                    self._data_ready.clear()
+
+                popleft = self.data_queue.popleft
+                batch = []
                 try:
-                    data_point = self.data_queue.get(timeout=1.0)
-                    self._write_to_file(data_point)
-                except queue.Empty:
-                    continue
+                    while len(batch) < self.WRITE_BATCH_SIZE:
+                        batch.append(popleft())
+                except IndexError:
+                    pass
+
+                self._write_batch(batch)
 
             except Exception as e:
-                print(f"Error in logging worker: {e}")
-                time.sleep(1)
+                logger.error("Error in logging worker: %s", e)
+                self._stop_event.wait(1.0)
 
     def _check_log_rotation(self):
         """Check if we need to rotate the log file"""
@@ -504,38 +928,49 @@ class ADCDataLogger:
 
             # Close current file
             if self.current_log_file:
-                self.current_log_file.close()
+                self._close_log_file()
 
             # Create new file
+            binary = self.config.file_format == 'binary'
             timestamp = datetime.fromtimestamp(current_time).strftime("%Y%m%d_%H%M%S")
-            filename = f"adc_data_{timestamp}.csv"
+            filename = f"adc_data_{timestamp}{_ADC_LOG_FORMATS['binary' if binary else 'csv']}"
+            os.makedirs(self.config.log_directory, exist_ok=True)
             filepath = os.path.join(self.config.log_directory, filename)
 
-            self.current_log_file = open(filepath, 'w', newline='')
+            # Large buffer: rows reach the disk about once per MB or per flush
+            # interval, so rows still buffered are lost on SIGKILL/power loss
+            self.current_log_file = open(filepath, 'wb', buffering=self.FILE_BUFFER_SIZE)
             self.log_file_start_time = current_time
-
-            # Write header
-            writer = csv.writer(self.current_log_file)
-            writer.writerow(['timestamp', 'datetime', 'channel', 'raw_value', 'voltage', 'vref'])
+            self._binary_log = binary
+            self.current_log_file.write(ADC_LOG_MAGIC if binary else self.CSV_HEADER)
 
             print(f"Started new log file: {filename}")
 
-    def _write_to_file(self, data_point: ADCDataPoint):
-        """Write a data point to the current log file"""
-        if not self.current_log_file:
+    def _close_log_file(self):
+        """Flush, sync and close the current log file"""
+        try:
+            self.current_log_file.flush()
+            os.fsync(self.current_log_file.fileno())
+        finally:
+            self.current_log_file.close()
+
+    def _write_batch(self, rows: List[tuple]):
+        """Write a batch of (timestamp, channel, raw_value, voltage, vref) rows to the current log file"""
+        if not self.current_log_file or not rows:
             return
 
-        writer = csv.writer(self.current_log_file)
-        dt = datetime.fromtimestamp(data_point.timestamp)
-        writer.writerow([
-            data_point.timestamp,
-            dt.isoformat(),
-            data_point.channel,
-            data_point.raw_value,
-            data_point.voltage,
-            data_point.vref
-        ])
-        self.current_log_file.flush()
+        # The whole batch goes out in one write
+        if self._binary_log:
+            pack = ADC_LOG_RECORD.pack
+            self.current_log_file.write(b''.join([pack(*row) for row in rows]))
+        else:
+            self.current_log_file.write(_format_csv_rows(rows))
+
+        # Flush on a timer rather than per row
+        now = time.monotonic()
+        if now - self._last_flush >= self.FLUSH_INTERVAL:
+            self.current_log_file.flush()
+            self._last_flush = now
 
 class HMIJsonAPI:
     """
@@ -568,12 +1003,131 @@ class HMIJsonAPI:
         # API state
         self.monitoring_active = False
         self.monitoring_thread = None
+        self.monitoring_dispatch_thread = None
+        # Double-buffer handoff from the I2C polling thread to the dispatch thread
+        self._monitoring_pending = []
+        self._monitoring_lock = threading.Lock()
+        self._monitoring_ready = threading.Event()
+        self._monitoring_stop = threading.Event()  # Wakes the poll thread on stop
         self.monitoring_interval = 1.0
-        self.data_queue = queue.Queue(maxsize=1000)
-        self.callbacks = {}  # Event callbacks
+        self.data_queue = deque(maxlen=1000)  # Oldest samples drop off when full
+        self.callbacks = {}  # Event callbacks (event_type -> tuple, replaced on register)
+        self._callbacks_lock = threading.Lock()
+        # Attach tracebacks to device command errors (HMI_DEBUG=1 enables at startup)
+        self.debug_tracebacks = os.environ.get('HMI_DEBUG', '').strip().lower() in ('1', 'true', 'yes', 'on')
         
-        # Device status tracking
+        # Wall-clock time read once per command (per thread) and shared by
+        # all timestamps in that command's response
+        self._clock = threading.local()
+        
+        # Command dispatch tables (action -> handler, device_id -> handler)
+        self._system_actions = {
+            'get_system_status': self._handle_get_system_status,
+            'get_device_list': self._handle_get_device_list,
+            'get_storage_info': self._handle_get_storage_info,
+            'format_drive': self._handle_format_drive,
+            'test_storage_speed': self._handle_test_storage_speed,
+            'start_monitoring': self._handle_start_monitoring,
+            'stop_monitoring': self._handle_stop_monitoring,
+            'set_debug': self._handle_set_debug
+        }
+        self._device_handlers = {
+            'adc': self._handle_adc_command,
+            'io': self._handle_io_command,
+            'rtc': self._handle_rtc_command,
+            'fan': self._handle_fan_command,
+            'eeprom': self._handle_eeprom_command,
+            'ai_vision': self._handle_ai_vision_command,
+            'can': self._handle_can_command,
+            'automation': self._handle_automation_command,
+            'audio': self._handle_audio_command,
+            'diag_agent': self._handle_diag_agent_command
+        }
+        
+        # Per-device action tables (action -> handler(device, params, request_id))
+        self._adc_actions = {
+            'read_channel': self._adc_read_channel,
+            'read_all_channels': self._adc_read_all_channels,
+            'set_vref': self._adc_set_vref,
+            'get_logged_data': self._adc_get_logged_data,
+            'start_logging': self._adc_start_logging,
+            'stop_logging': self._adc_stop_logging,
+            'get_logging_stats': self._adc_get_logging_stats,
+            'export_csv': self._adc_export_csv
+        }
+        self._io_actions = {
+            'read_pin': self._io_read_pin,
+            'write_pin': self._io_write_pin,
+            'configure_pin': self._io_configure_pin,
+            'read_all_pins': self._io_read_all_pins,
+            'reset': self._io_reset
+        }
+        self._rtc_actions = {
+            'read_datetime': self._rtc_read_datetime,
+            'set_datetime': self._rtc_set_datetime,
+            'set_clkout': self._rtc_set_clkout
+        }
+        self._fan_actions = {
+            'set_pwm': self._fan_set_pwm,
+            'set_rpm': self._fan_set_rpm,
+            'read_rpm': self._fan_read_rpm,
+            'get_status': self._fan_get_status,
+            'configure': self._fan_configure
+        }
+        self._eeprom_actions = {
+            'read': self._eeprom_read,
+            'write': self._eeprom_write,
+            'read_string': self._eeprom_read_string,
+            'write_string': self._eeprom_write_string,
+            'get_info': self._eeprom_get_info,
+            'test': self._eeprom_test
+        }
+        self._ai_vision_actions = {
+            'get_status': self._ai_vision_get_status,
+            'list_cameras': self._ai_vision_list_cameras,
+            'start': self._ai_vision_start,
+            'stop': self._ai_vision_stop,
+            'set_confidence': self._ai_vision_set_confidence,
+            'get_frame': self._ai_vision_get_frame,
+            'get_detections': self._ai_vision_get_detections,
+            'get_available_models': self._ai_vision_get_available_models
+        }
+        
+        # Monitoring readers (device_id -> per-tick snapshot)
+        self._device_readers = {
+            'adc': self._read_adc_data,
+            'io': self._read_io_data,
+            'rtc': self._read_rtc_data,
+            'fan': self._read_fan_data,
+            'eeprom': self._read_eeprom_data
+        }
+        # Recent reader results (device_id -> (monotonic time, data)) so
+        # overlapping reads of the same device share one bus transaction
+        self._device_data_cache = {}
+        self._device_data_ttl = {'eeprom': 1.0, 'fan': 0.1}
+        self._default_device_data_ttl = 0.05
+        # Monitoring reads of different devices overlap on this pool; created
+        # when monitoring starts and shut down by disconnect_all
+        self._reader_pool = None
+        # Response skeletons per reader; copied and filled in on each read
+        self._device_data_templates = {
+            'adc': {'type': 'adc', 'channels': None, 'vref': None, 'status': 'ok'},
+            'io': {'type': 'io', 'pins': None, 'status': 'ok'},
+            'rtc': {'type': 'rtc', 'datetime': None, 'status': 'error'},
+            'fan': {'type': 'fan', 'rpm': None, 'pwm_duty_cycle': None, 'fan_status': None, 'status': 'error'},
+            'eeprom': {'type': 'eeprom', 'test_read': None, 'memory_size': None, 'status': 'error'}
+        }
+        
+        # Device status tracking (plus a serialized view, rebuilt only on change)
         self.device_status = {}
+        self._device_status_dict = {}
+        
+        # Serialized get_system_status cache, invalidated by bumping the version
+        self._status_version = 0
+        self._status_cache = None  # (version, created_at, json, APIResponse)
+
+        # I/O pin configuration cache (pin -> info), invalidated on configure/reset
+        self._io_pin_info_cache: Dict[int, Dict] = {}
 
         # ADC Data Logger
         logging_config = LoggingConfig(
@@ -601,13 +1155,13 @@ class HMIJsonAPI:
                 if self.ai_vision.initialize():
                     print("AI-Vision system initialized successfully")
                     self.devices['ai_vision'] = self.ai_vision
-                    self.device_status['ai_vision'] = DeviceStatus(
+                    self._set_device_status('ai_vision', DeviceStatus(
                         device_type="AIVisionSystem",
                         device_id="ai_vision",
                         connected=True,
                         last_update=time.time(),
                         capabilities=['object_detection', 'camera_streaming', 'real_time_inference']
-                    )
+                    ))
                 else:
                     print("Failed to initialize AI-Vision system")
             except Exception as e:
@@ -623,6 +1177,7 @@ class HMIJsonAPI:
             Dict[str, bool]: Connection status for each device
         """
         connection_results = {}
+        now = time.time()
         
         for device_id, config in self.device_configs.items():
             try:
@@ -657,61 +1212,115 @@ class HMIJsonAPI:
                 
                 if connected:
                     self.devices[device_id] = device
-                    self.device_status[device_id] = DeviceStatus(
+                    if device_id == 'io':
+                        self._io_pin_info_cache = {pin: device.get_pin_info(pin) for pin in range(16)}
+                    self._set_device_status(device_id, DeviceStatus(
                         device_type=device_class.__name__,
                         device_id=device_id,
                         connected=True,
-                        last_update=time.time(),
+                        last_update=now,
                         capabilities=self._get_device_capabilities(device_id)
-                    )
+                    ))
                     connection_results[device_id] = True
                 else:
                     connection_results[device_id] = False
-                    self.device_status[device_id] = DeviceStatus(
+                    self._set_device_status(device_id, DeviceStatus(
                         device_type=device_class.__name__,
                         device_id=device_id,
                         connected=False,
-                        last_update=time.time(),
+                        last_update=now,
                         error_message="Connection failed"
-                    )
+                    ))
                     
             except Exception as e:
                 connection_results[device_id] = False
-                self.device_status[device_id] = DeviceStatus(
+                self._set_device_status(device_id, DeviceStatus(
                     device_type=config['class'].__name__,
                     device_id=device_id,
                     connected=False,
-                    last_update=time.time(),
+                    last_update=now,
                     error_message=str(e)
-                )
+                ))
         
         return connection_results
     
+    def _get_io_pin_info(self, device, pin: int) -> Dict:
+        """Get cached I/O pin info, reading it from the device on a miss"""
+        info = self._io_pin_info_cache.get(pin)
+        if info is None:
+            info = device.get_pin_info(pin)
+            self._io_pin_info_cache[pin] = info
+        return info
+    
+    def _set_device_status(self, device_id: str, status: DeviceStatus):
+        """Record a device status and refresh its cached dict view"""
+        self.device_status[device_id] = status
+        self._device_status_dict[device_id] = asdict(status)
+        self._status_version += 1
+    
     def _get_device_capabilities(self, device_id: str) -> List[str]:
         """Get list of capabilities for a device"""
-        capabilities = {
-            'adc': ['read_channel', 'read_all_channels', 'set_vref', 'get_status'],
-            'io': ['read_pin', 'write_pin', 'configure_pin', 'read_all_pins', 'reset', 'get_status'],
-            'rtc': ['read_datetime', 'set_datetime', 'set_alarm', 'set_clkout', 'get_status'],
-            'fan': ['set_pwm', 'set_rpm', 'read_rpm', 'get_status', 'configure'],
-            'eeprom': ['read', 'write', 'read_string', 'write_string', 'erase', 'test', 'get_info'],
-            'audio': ['get_status', 'get_all_controls', 'get_volume_controls', 'get_switch_controls', 'get_eq_controls', 'set_control', 'get_control', 'refresh_controls']
-        }
-        return capabilities.get(device_id, [])
+        return _DEVICE_CAPABILITIES.get(device_id, [])
     
-    def process_json_command(self, json_command: str) -> str:
+    def process_json_command(self, json_command: Union[str, bytes, bytearray, memoryview]) -> str:
         """
         Process a JSON command and return JSON response
         
         Args:
-            json_command (str): JSON command string
+            json_command: JSON command as str, or raw UTF-8 bytes straight from a socket
             
         Returns:
             str: JSON response string
         """
         try:
+            result = self._run_json_command(json_command)
+            return result.text if isinstance(result, SerializedResponse) else _json_dumps(result)
+        except Exception as e:
+            return self._error_response(f"Unexpected error: {e}").text
+    
+    def process_json_command_bytes(self, json_command: Union[str, bytes, bytearray, memoryview]) -> bytes:
+        """
+        Process a JSON command and return the JSON response as UTF-8 bytes
+        
+        Same as process_json_command, but skips the str round-trip for
+        callers that write the response straight to a socket or HTTP body.
+        """
+        try:
+            result = self._run_json_command(json_command)
+            return result.text.encode() if isinstance(result, SerializedResponse) else _json_dumps_bytes(result)
+        except Exception as e:
+            return self._error_response(f"Unexpected error: {e}").text.encode()
+    
+    def process_json_command_msgpack(self, json_command: Union[str, bytes, bytearray, memoryview]) -> bytes:
+        """
+        Process a JSON command and return the response packed as MessagePack
+        
+        Requires msgpack (see MSGPACK_AVAILABLE). Commands are still JSON;
+        only the response encoding differs.
+        """
+        try:
+            result = self._run_json_command(json_command)
+        except Exception as e:
+            result = self._error_response(f"Unexpected error: {e}")
+        # Pre-serialized responses pack from their fields like any other
+        return _msgpack_dumps(result)
+    
+    def _run_json_command(self, json_command) -> APIResponse:
+        """Parse and route a command, returning its APIResponse"""
+        self._clock.now = time.time()
+        try:
+            # Cheap checks before handing the input to the parser
+            if len(json_command) > _MAX_COMMAND_SIZE:
+                return self._error_response(f"Command exceeds {_MAX_COMMAND_SIZE} bytes")
+            head = json_command[:16]
+            if isinstance(head, memoryview):
+                head = head.tobytes()
+            first = head.lstrip()[:1]
+            if first and first not in ('{', b'{'):
+                return self._error_response("Command must be a JSON object")
+            
             # Parse JSON command
-            command = json.loads(json_command)
+            command = _json_loads(json_command)
             
             # Validate basic command structure
             if not isinstance(command, dict):
@@ -722,55 +1331,102 @@ class HMIJsonAPI:
             
             # Extract common fields
             action = command.get('action')
+            
+            # Status polls without a request_id can share a recent serialized response
+            if action == 'get_system_status' and 'request_id' not in command:
+                return self._get_system_status_json()
+            
             device = command.get('device')
             params = command.get('params', {})
-            request_id = command.get('request_id', str(uuid.uuid4()))
+            request_id = command.get('request_id')
+            if request_id is None:
+                request_id = f"{_REQUEST_ID_TAG}-{next(_request_counter)}"
             
             # Route command to appropriate handler
-            if action == 'get_system_status':
-                response = self._handle_get_system_status(request_id)
-            elif action == 'get_device_list':
-                response = self._handle_get_device_list(request_id)
-            elif action == 'get_storage_info':
-                response = self._handle_get_storage_info(request_id)
-            elif action == 'format_drive':
-                response = self._handle_format_drive(request_id, params)
-            elif action == 'test_storage_speed':
-                response = self._handle_test_storage_speed(request_id, params)
-            elif action == 'start_monitoring':
-                response = self._handle_start_monitoring(request_id, params)
-            elif action == 'stop_monitoring':
-                response = self._handle_stop_monitoring(request_id)
+            handler = self._system_actions.get(action)
+            if handler:
+                return handler(request_id, params)
             elif device:
-                response = self._handle_device_command(action, device, params, request_id)
+                return self._handle_device_command(action, device, params, request_id)
             else:
-                response = self._error_response("Unknown action or missing device", request_id)
-            
-            return json.dumps(asdict(response), indent=2)
+                return self._error_response("Unknown action or missing device", request_id)
             
         except json.JSONDecodeError as e:
             return self._error_response(f"Invalid JSON: {e}")
         except Exception as e:
             return self._error_response(f"Unexpected error: {e}")
+        finally:
+            self._clock.now = None
+    
+    def _now(self) -> float:
+        """Timestamp of the command being processed, or the current time outside one"""
+        return getattr(self._clock, 'now', None) or time.time()
     
-    def _handle_get_system_status(self, request_id: str) -> APIResponse:
+    def _handle_get_system_status(self, request_id: str, params: Dict = None) -> APIResponse:
         """Get overall system status"""
+        now = self._now()
         status_data = {
-            'timestamp': time.time(),
+            'timestamp': now,
             'bus_number': self.bus_number,
             'monitoring_active': self.monitoring_active,
             'monitoring_interval': self.monitoring_interval,
-            'devices': {device_id: asdict(status) for device_id, status in self.device_status.items()}
+            'devices': self._device_status_dict
         }
         
         return APIResponse(
             success=True,
-            timestamp=time.time(),
+            timestamp=now,
             request_id=request_id,
             data=status_data
         )
     
-    def _handle_get_device_list(self, request_id: str) -> APIResponse:
+    def _get_system_status_json(self) -> SerializedResponse:
+        """
+        Serialized system status for polls without a request_id
+
+        The body is reused for up to 100 ms while the status version is
+        unchanged, so its timestamp can be that old; each call still gets
+        its own request_id, substituted into the cached text.
+        """
+        now = time.monotonic()
+        cache = self._status_cache
+        if cache is None or cache[0] != self._status_version or now - cache[1] >= 0.1:
+            version = self._status_version
+            status = self._handle_get_system_status(_STATUS_REQUEST_ID_PLACEHOLDER)
+            cache = self._status_cache = (version, now, _json_dumps(status), status)
+        
+        _, _, text, status = cache
+        request_id = f"{_REQUEST_ID_TAG}-{next(_request_counter)}"
+        # request_id precedes data in the body, so the first match is the field
+        text = text.replace(_STATUS_REQUEST_ID_JSON, _json_scalar(request_id), 1)
+        return SerializedResponse(
+            text, status.success, status.timestamp, request_id,
+            status.data, status.error, status.warnings
+        )
+    
+    def get_system_status_etag(self) -> str:
+        """
+        Validator for the system status, changing whenever device or monitoring state does
+        
+        Weak because the body also carries a fresh timestamp; the process tag
+        keeps validators from a previous run from matching after a restart.
+        """
+        return f'W/"{_REQUEST_ID_TAG}-{self._status_version}"'
+    
+    def _handle_set_debug(self, request_id: str, params: Dict = None) -> APIResponse:
+        """Toggle debug output such as device command tracebacks"""
+        params = params or {}
+        if 'tracebacks' in params:
+            self.debug_tracebacks = bool(params['tracebacks'])
+        
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'tracebacks': self.debug_tracebacks}
+        )
+    
+    def _handle_get_device_list(self, request_id: str, params: Dict = None) -> APIResponse:
         """Get list of available devices and their capabilities"""
         devices_data = {}
         
@@ -785,19 +1441,19 @@ class HMIJsonAPI:
         
         return APIResponse(
             success=True,
-            timestamp=time.time(),
+            timestamp=self._now(),
             request_id=request_id,
             data={'devices': devices_data}
         )
 
-    def _handle_get_storage_info(self, request_id: str) -> APIResponse:
+    def _handle_get_storage_info(self, request_id: str, params: Dict = None) -> APIResponse:
         """Get storage information including NVMe PCIe drives"""
         try:
             storage_data = self._get_storage_info()
 
             return APIResponse(
                 success=True,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 request_id=request_id,
                 data=storage_data
             )
@@ -828,7 +1484,7 @@ class HMIJsonAPI:
             if format_result['success']:
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={
                         'message': f"Successfully formatted {device_path} with {filesystem}",
@@ -942,7 +1598,7 @@ class HMIJsonAPI:
             if speed_test_result['success']:
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=speed_test_result
                 )
@@ -988,13 +1644,13 @@ class HMIJsonAPI:
 
             # Write test
             print(f"Testing write speed for {device_path}...")
-            start_time = time.time()
+            start_time = time.monotonic()
             write_result = subprocess.run([
                 'sudo', 'dd', f'if=/dev/zero', f'of={test_file}',
                 f'bs=1M', f'count={test_size[:-1]}', 'conv=fdatasync'
             ], capture_output=True, text=True, timeout=120)
 
-            write_time = time.time() - start_time
+            write_time = time.monotonic() - start_time
             results['write_time_seconds'] = round(write_time, 2)
 
             if write_result.returncode == 0:
@@ -1016,13 +1672,13 @@ class HMIJsonAPI:
 
             # Read test
             print(f"Testing read speed for {device_path}...")
-            start_time = time.time()
+            start_time = time.monotonic()
             read_result = subprocess.run([
                 'sudo', 'dd', f'if={test_file}', f'of=/dev/null',
                 f'bs=1M'
             ], capture_output=True, text=True, timeout=120)
 
-            read_time = time.time() - start_time
+            read_time = time.monotonic() - start_time
             results['read_time_seconds'] = round(read_time, 2)
 
             if read_result.returncode == 0:
@@ -1241,7 +1897,7 @@ class HMIJsonAPI:
                                   capture_output=True, text=True, timeout=10)
 
             if result.returncode == 0:
-                lsblk_data = json.loads(result.stdout)
+                lsblk_data = _json_loads(result.stdout)
 
                 for device in lsblk_data.get('blockdevices', []):
                     # Check if it's a disk (not partition) without filesystem
@@ -1299,39 +1955,27 @@ class HMIJsonAPI:
         if device_id not in self.devices:
             return APIResponse(
                 success=False,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 request_id=request_id,
                 error=f"Device '{device_id}' not found or not connected"
             )
         
         device = self.devices[device_id]
         
+        # Commands may change device state (pin writes, PWM), so the next
+        # monitoring read must go to the bus
+        if (device_id, action) not in _CACHED_READ_ACTIONS:
+            self._device_data_cache.pop(device_id, None)
+        
         try:
             # Route to device-specific handlers
-            if device_id == 'adc':
-                return self._handle_adc_command(device, action, params, request_id)
-            elif device_id == 'io':
-                return self._handle_io_command(device, action, params, request_id)
-            elif device_id == 'rtc':
-                return self._handle_rtc_command(device, action, params, request_id)
-            elif device_id == 'fan':
-                return self._handle_fan_command(device, action, params, request_id)
-            elif device_id == 'eeprom':
-                return self._handle_eeprom_command(device, action, params, request_id)
-            elif device_id == 'ai_vision':
-                return self._handle_ai_vision_command(device, action, params, request_id)
-            elif device_id == 'can':
-                return self._handle_can_command(device, action, params, request_id)
-            elif device_id == 'automation':
-                return self._handle_automation_command(device, action, params, request_id)
-            elif device_id == 'audio':
-                return self._handle_audio_command(device, action, params, request_id)
-            elif device_id == 'diag_agent':
-                return self._handle_diag_agent_command(device, action, params, request_id)
+            handler = self._device_handlers.get(device_id)
+            if handler:
+                return handler(device, action, params, request_id)
             else:
                 return APIResponse(
                     success=False,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     error=f"No handler for device type '{device_id}'"
                 )
@@ -1339,685 +1983,786 @@ class HMIJsonAPI:
         except Exception as e:
             return APIResponse(
                 success=False,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 request_id=request_id,
                 error=f"Device command failed: {e}",
-                data={'traceback': traceback.format_exc()}
+                data={'traceback': traceback.format_exc()} if self.debug_tracebacks else None
             )
     
     def _handle_adc_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
         """Handle ADC-specific commands"""
-        
-        if action == 'read_channel':
-            channel = params.get('channel', 0)
-            if not (0 <= channel <= 7):
-                return self._error_response("Channel must be 0-7", request_id)
-
-            # Use averaged reading for stability
-            raw_value = device.read_channel_averaged(channel, samples=4)
-            voltage = (raw_value / 4095.0) * device.vref
-            timestamp = time.time()
-
-            # Log the reading
-            data_point = ADCDataPoint(
-                timestamp=timestamp,
-                channel=channel,
-                raw_value=raw_value,
-                voltage=voltage,
-                vref=device.vref
-            )
-            self.adc_logger.log_adc_reading(data_point)
+        handler = self._adc_actions.get(action)
+        if handler is None:
+            return self._error_response(f"Unknown ADC action: {action}", request_id)
+        return handler(device, params, request_id)
+    
+    def _adc_read_channel(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read one channel (averaged) and log it"""
+        channel = params.get('channel', 0)
+        if channel not in _VALID_ADC_CHANNELS:
+            return self._error_response("Channel must be 0-7", request_id)
+
+        # Use averaged reading for stability
+        raw_value = device.read_channel_averaged(channel, samples=4)
+        voltage = (raw_value / 4095.0) * device.vref
+        timestamp = self._now()
+
+        # Log the reading
+        data_point = ADCDataPoint(
+            timestamp=timestamp,
+            channel=channel,
+            raw_value=raw_value,
+            voltage=voltage,
+            vref=device.vref
+        )
+        self.adc_logger.log_adc_reading(data_point)
 
-            return APIResponse(
-                success=True,
-                timestamp=timestamp,
-                request_id=request_id,
-                data={
-                    'channel': channel,
-                    'raw_value': raw_value,
-                    'voltage': voltage,
-                    'vref': device.vref
-                }
-            )
-        
-        elif action == 'read_all_channels':
-            channels_data = []
-            timestamp = time.time()
-
-            for channel in range(8):
-                # Use averaged reading for stability
-                raw_value = device.read_channel_averaged(channel, samples=3)
-                voltage = (raw_value / 4095.0) * device.vref
-                channels_data.append({
-                    'channel': channel,
-                    'raw_value': raw_value,
-                    'voltage': voltage
-                })
-
-                # Log each channel reading
-                data_point = ADCDataPoint(
-                    timestamp=timestamp,
-                    channel=channel,
-                    raw_value=raw_value,
-                    voltage=voltage,
-                    vref=device.vref
-                )
-                self.adc_logger.log_adc_reading(data_point)
+        return APIResponse(
+            success=True,
+            timestamp=timestamp,
+            request_id=request_id,
+            data={
+                'channel': channel,
+                'raw_value': raw_value,
+                'voltage': voltage,
+                'vref': device.vref
+            }
+        )
+    
+    def _adc_read_all_channels(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read all channels in one burst and log them"""
+        timestamp = self._now()
 
-            return APIResponse(
-                success=True,
-                timestamp=timestamp,
-                request_id=request_id,
-                data={
-                    'channels': channels_data,
-                    'vref': device.vref
-                }
-            )
-        
-        elif action == 'set_vref':
-            vref = params.get('vref')
-            if not vref or not isinstance(vref, (int, float)):
-                return self._error_response("Invalid vref value", request_id)
-            
-            device.vref = float(vref)
-            
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'vref': device.vref}
-            )
-        
-        elif action == 'get_logged_data':
-            # Get parameters
-            channel = params.get('channel')  # None means all channels
-            max_points = params.get('max_points', 100)
-            time_range_seconds = params.get('time_range_seconds')
-
-            # Get data from logger
-            data = self.adc_logger.get_recent_data(
-                channel=channel,
-                max_points=max_points,
-                time_range_seconds=time_range_seconds
-            )
+        # Use averaged burst reading for stability
+        raw_values = device.read_all_raw(samples=3)
+        voltages = _adc_raws_to_voltages(raw_values, device.vref)
 
-            # Convert to JSON-serializable format
-            result = {}
-            for ch, points in data.items():
-                result[str(ch)] = [
-                    {
-                        'timestamp': dp.timestamp,
-                        'channel': dp.channel,
-                        'raw_value': dp.raw_value,
-                        'voltage': dp.voltage,
-                        'vref': dp.vref
-                    }
-                    for dp in points
-                ]
+        channels_data = [
+            {'channel': channel, 'raw_value': raw_value, 'voltage': voltage}
+            for channel, raw_value, voltage in zip(_ADC_CHANNELS, raw_values, voltages)
+        ]
 
-            return APIResponse(
+        # Log all channel readings in one call, straight into the logger's rings
+        self.adc_logger.log_batch(timestamp, raw_values, voltages, device.vref)
+
+        return APIResponse(
+            success=True,
+            timestamp=timestamp,
+            request_id=request_id,
+            data={
+                'channels': channels_data,
+                'vref': device.vref
+            }
+        )
+    
+    def _adc_set_vref(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Set the ADC reference voltage"""
+        vref = params.get('vref')
+        if not vref or not isinstance(vref, (int, float)):
+            return self._error_response("Invalid vref value", request_id)
+
+        device.vref = float(vref)
+
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'vref': device.vref}
+        )
+    
+    def _adc_get_logged_data(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Return recent logged readings"""
+        # Get parameters
+        channel = params.get('channel')  # None means all channels
+        max_points = params.get('max_points', 100)
+        time_range_seconds = params.get('time_range_seconds')
+
+        # Get data from logger
+        data = self.adc_logger.get_recent_rows(
+            channel=channel,
+            max_points=max_points,
+            time_range_seconds=time_range_seconds
+        )
+
+        # layout='columns' returns parallel arrays per channel, compactly
+        # encoded unless pretty=True; the default stays one record per point
+        if params.get('layout') == 'columns':
+            result = {}
+            for ch, rows in data.items():
+                ts, raw, volt, vref = zip(*rows) if rows else ((), (), (), ())
+                result[str(ch)] = {'ts': ts, 'raw': raw, 'volt': volt, 'vref': vref}
+            response = APIResponse(
                 success=True,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 request_id=request_id,
                 data={
                     'logged_data': result,
                     'logging_stats': self.adc_logger.get_logging_stats()
                 }
             )
-
-        elif action == 'start_logging':
-            if not self.adc_logger.logging_active:
-                self.adc_logger.config.enabled = True  # Enable logging config
-                self.adc_logger.start_logging()
-
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'logging_active': self.adc_logger.logging_active}
-            )
-
-        elif action == 'stop_logging':
-            if self.adc_logger.logging_active:
-                self.adc_logger.config.enabled = False  # Disable logging config
-                self.adc_logger.stop_logging()
-
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'logging_active': self.adc_logger.logging_active}
+            if params.get('pretty'):
+                return response
+            return SerializedResponse(
+                _json_compact(response), response.success, response.timestamp,
+                response.request_id, response.data
             )
 
-        elif action == 'get_logging_stats':
-            stats = self.adc_logger.get_logging_stats()
+        # Convert to JSON-serializable format
+        result = {}
+        for ch, rows in data.items():
+            result[str(ch)] = [
+                {
+                    'timestamp': ts,
+                    'channel': ch,
+                    'raw_value': raw,
+                    'voltage': volt,
+                    'vref': vref
+                }
+                for ts, raw, volt, vref in rows
+            ]
 
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data=stats
-            )
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'logged_data': result,
+                'logging_stats': self.adc_logger.get_logging_stats()
+            }
+        )
+    
+    def _adc_start_logging(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Enable ADC logging and start the file writer"""
+        file_format = params.get('file_format')
+        if file_format is not None:
+            if file_format not in _ADC_LOG_FORMATS:
+                return self._error_response("file_format must be 'csv' or 'binary'", request_id)
+            # Takes effect with the next log file
+            self.adc_logger.config.file_format = file_format
+        
+        if not self.adc_logger.logging_active:
+            self.adc_logger.set_enabled(True)  # Enable logging config
+            self.adc_logger.start_logging()
 
-        elif action == 'export_csv':
-            filename = params.get('filename', f"adc_export_{int(time.time())}.csv")
-            channel = params.get('channel')
-            time_range_seconds = params.get('time_range_seconds')
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'logging_active': self.adc_logger.logging_active}
+        )
+    
+    def _adc_stop_logging(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Stop the file writer and disable ADC logging"""
+        if self.adc_logger.logging_active:
+            self.adc_logger.set_enabled(False)  # Disable logging config
+            self.adc_logger.stop_logging()
 
-            success = self.adc_logger.export_data_csv(
-                filename=filename,
-                channel=channel,
-                time_range_seconds=time_range_seconds
-            )
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'logging_active': self.adc_logger.logging_active}
+        )
+    
+    def _adc_get_logging_stats(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Return ADC logger statistics"""
+        stats = self.adc_logger.get_logging_stats()
 
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'filename': filename, 'exported': success}
-            )
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data=stats
+        )
+    
+    def _adc_export_csv(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Export logged readings to a CSV file"""
+        timestamp = self._now()
+        filename = params.get('filename', f"adc_export_{int(timestamp)}.csv")
+        channel = params.get('channel')
+        time_range_seconds = params.get('time_range_seconds')
+
+        success = self.adc_logger.export_data_csv(
+            filename=filename,
+            channel=channel,
+            time_range_seconds=time_range_seconds
+        )
 
-        else:
-            return self._error_response(f"Unknown ADC action: {action}", request_id)
+        return APIResponse(
+            success=success,
+            timestamp=timestamp,
+            request_id=request_id,
+            data={'filename': filename, 'exported': success}
+        )
     
     def _handle_io_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
         """Handle I/O expander commands"""
-        
-        if action == 'read_pin':
-            pin = params.get('pin')
-            if not isinstance(pin, int) or not (0 <= pin <= 15):
-                return self._error_response("Pin must be 0-15", request_id)
-            
-            state = device.read_pin(pin)
-            pin_info = device.get_pin_info(pin)
-            
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'pin': pin,
-                    'state': state,
-                    'info': pin_info
-                }
-            )
-        
-        elif action == 'write_pin':
-            pin = params.get('pin')
-            state = params.get('state')
-            
-            if not isinstance(pin, int) or not (0 <= pin <= 15):
-                return self._error_response("Pin must be 0-15", request_id)
-            
-            success = device.write_pin(pin, bool(state))
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'pin': pin,
-                    'state': bool(state),
-                    'write_success': success
-                }
-            )
-        
-        elif action == 'configure_pin':
-            pin = params.get('pin')
-            direction = params.get('direction', 'input')
-            pullup = params.get('pullup', True)
-            
-            if not isinstance(pin, int) or not (0 <= pin <= 15):
-                return self._error_response("Pin must be 0-15", request_id)
-            
-            success = device.configure_pin(pin, direction, pullup)
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'pin': pin,
-                    'direction': direction,
-                    'pullup': pullup,
-                    'configure_success': success
-                }
-            )
-        
-        elif action == 'read_all_pins':
-            pins_data = []
-            for pin in range(16):
-                state = device.read_pin(pin)
-                info = device.get_pin_info(pin)
-                pins_data.append({
-                    'pin': pin,
-                    'state': state,
-                    'info': info
-                })
-            
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'pins': pins_data}
-            )
-        
-        elif action == 'reset':
-            success = device.reset_to_defaults()
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'reset_success': success}
-            )
-        
-        else:
+        handler = self._io_actions.get(action)
+        if handler is None:
             return self._error_response(f"Unknown I/O action: {action}", request_id)
+        return handler(device, params, request_id)
+    
+    def _io_read_pin(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read one pin state and its configuration"""
+        pin = params.get('pin')
+        if not (isinstance(pin, int) and pin in _VALID_IO_PINS):
+            return self._error_response("Pin must be 0-15", request_id)
+
+        state = device.read_pin(pin)
+        pin_info = self._get_io_pin_info(device, pin)
+
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'pin': pin,
+                'state': state,
+                'info': pin_info
+            }
+        )
+    
+    def _io_write_pin(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Drive an output pin"""
+        pin = params.get('pin')
+        state = params.get('state')
+
+        if not (isinstance(pin, int) and pin in _VALID_IO_PINS):
+            return self._error_response("Pin must be 0-15", request_id)
+
+        success = device.write_pin(pin, bool(state))
+
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'pin': pin,
+                'state': bool(state),
+                'write_success': success
+            }
+        )
+    
+    def _io_configure_pin(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Set pin direction and pull-up"""
+        pin = params.get('pin')
+        direction = params.get('direction', 'input')
+        pullup = params.get('pullup', True)
+
+        if not (isinstance(pin, int) and pin in _VALID_IO_PINS):
+            return self._error_response("Pin must be 0-15", request_id)
+
+        success = device.configure_pin(pin, direction, pullup)
+        self._io_pin_info_cache.pop(pin, None)
+
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'pin': pin,
+                'direction': direction,
+                'pullup': pullup,
+                'configure_success': success
+            }
+        )
+    
+    def _io_read_all_pins(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read all 16 pins in one transfer"""
+        # Both input ports in a single read, then slice out each pin
+        states = _word_to_pin_states(device.read_all_pins_raw())
+        pins_data = [
+            {'pin': pin, 'state': state, 'info': self._get_io_pin_info(device, pin)}
+            for pin, state in zip(_IO_PINS, states)
+        ]
+
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'pins': pins_data}
+        )
+    
+    def _io_reset(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Reset the expander to its power-on configuration"""
+        success = device.reset_to_defaults()
+        self._io_pin_info_cache.clear()
+
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'reset_success': success}
+        )
     
     def _handle_rtc_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
         """Handle RTC commands"""
-        
-        if action == 'read_datetime':
-            datetime_info = device.read_datetime()
-            
-            return APIResponse(
-                success=datetime_info is not None,
-                timestamp=time.time(),
-                request_id=request_id,
-                data=datetime_info
-            )
-        
-        elif action == 'set_datetime':
-            datetime_str = params.get('datetime')
-            if not datetime_str:
-                return self._error_response("Missing datetime parameter", request_id)
-            
-            try:
-                # Parse datetime string (ISO format expected)
-                dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-                success = device.set_datetime(
-                    dt.year, dt.month, dt.day,
-                    dt.hour, dt.minute, dt.second
-                )
-                
-                return APIResponse(
-                    success=success,
-                    timestamp=time.time(),
-                    request_id=request_id,
-                    data={
-                        'datetime': datetime_str,
-                        'set_success': success
-                    }
-                )
-                
-            except ValueError as e:
-                return self._error_response(f"Invalid datetime format: {e}", request_id)
-        
-        elif action == 'set_clkout':
-            frequency = params.get('frequency', 0)
-            if not isinstance(frequency, int) or not (0 <= frequency <= 7):
-                return self._error_response("Frequency must be 0-7", request_id)
-            
-            success = device.set_clkout_frequency(frequency)
-            
+        handler = self._rtc_actions.get(action)
+        if handler is None:
+            return self._error_response(f"Unknown RTC action: {action}", request_id)
+        return handler(device, params, request_id)
+    
+    def _rtc_read_datetime(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read the current date and time"""
+        datetime_info = device.read_datetime()
+
+        return APIResponse(
+            success=datetime_info is not None,
+            timestamp=self._now(),
+            request_id=request_id,
+            data=datetime_info
+        )
+    
+    def _rtc_set_datetime(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Set the clock from an ISO datetime string"""
+        datetime_str = params.get('datetime')
+        if not datetime_str:
+            return self._error_response("Missing datetime parameter", request_id)
+
+        try:
+            # Parse datetime string (ISO format expected)
+            success = device.set_datetime(*_parse_datetime_fields(datetime_str))
+
             return APIResponse(
                 success=success,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 request_id=request_id,
                 data={
-                    'frequency': frequency,
+                    'datetime': datetime_str,
                     'set_success': success
                 }
             )
-        
-        else:
-            return self._error_response(f"Unknown RTC action: {action}", request_id)
+
+        except ValueError as e:
+            return self._error_response(f"Invalid datetime format: {e}", request_id)
+    
+    def _rtc_set_clkout(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Select the CLKOUT frequency (0-7)"""
+        frequency = params.get('frequency', 0)
+        if not (isinstance(frequency, int) and frequency in _VALID_CLKOUT_FREQUENCIES):
+            return self._error_response("Frequency must be 0-7", request_id)
+
+        success = device.set_clkout_frequency(frequency)
+
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'frequency': frequency,
+                'set_success': success
+            }
+        )
     
     def _handle_fan_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
         """Handle fan controller commands"""
-        
-        if action == 'set_pwm':
-            duty_cycle = params.get('duty_cycle')
-            if not isinstance(duty_cycle, (int, float)) or not (0 <= duty_cycle <= 100):
-                return self._error_response("duty_cycle must be 0-100", request_id)
-            
-            success = device.set_pwm_duty_cycle(float(duty_cycle))
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'duty_cycle': duty_cycle,
-                    'set_success': success
-                }
-            )
-        
-        elif action == 'set_rpm':
-            target_rpm = params.get('target_rpm')
-            if not isinstance(target_rpm, int) or not (0 <= target_rpm <= 65535):
-                return self._error_response("target_rpm must be 0-65535", request_id)
-            
-            # Enable RPM control mode
-            device.configure_fan(enable_rpm_control=True)
-            success = device.set_fan_target_rpm(target_rpm)
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'target_rpm': target_rpm,
-                    'set_success': success
-                }
-            )
-        
-        elif action == 'read_rpm':
-            rpm = device.read_fan_rpm()
-            pwm = device.get_pwm_duty_cycle()
-            status = device.get_fan_status()
-            
-            return APIResponse(
-                success=rpm is not None,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'rpm': rpm,
-                    'pwm_duty_cycle': pwm,
-                    'status': status
-                }
-            )
-        
-        elif action == 'get_status':
-            rpm = device.read_fan_rpm()
-            pwm = device.get_pwm_duty_cycle()
-            fan_status = device.get_fan_status()
+        handler = self._fan_actions.get(action)
+        if handler is None:
+            return self._error_response(f"Unknown fan action: {action}", request_id)
+        return handler(device, params, request_id)
+    
+    def _fan_set_pwm(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Set the PWM duty cycle (0-100%)"""
+        duty_cycle = params.get('duty_cycle')
+        if not isinstance(duty_cycle, (int, float)) or not (0 <= duty_cycle <= 100):
+            return self._error_response("duty_cycle must be 0-100", request_id)
 
-            # Calculate target RPM based on current PWM (rough approximation)
-            target_rpm = int((pwm / 100.0) * 3000) if pwm else 0
+        success = device.set_pwm_duty_cycle(float(duty_cycle))
 
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'rpm': rpm or 0,
-                    'target_rpm': target_rpm,
-                    'duty_cycle': pwm or 0,
-                    'failure': False  # Could be enhanced to detect actual failures
-                }
-            )
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'duty_cycle': duty_cycle,
+                'set_success': success
+            }
+        )
+    
+    def _fan_set_rpm(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Switch to RPM control and set the target speed"""
+        target_rpm = params.get('target_rpm')
+        if not isinstance(target_rpm, int) or not (0 <= target_rpm <= 65535):
+            return self._error_response("target_rpm must be 0-65535", request_id)
 
-        elif action == 'configure':
-            rpm_control = params.get('rpm_control', True)
-            poles = params.get('poles', 2)
-            edges = params.get('edges', 1)
+        # Enable RPM control mode
+        device.configure_fan(enable_rpm_control=True)
+        success = device.set_fan_target_rpm(target_rpm)
 
-            success = device.configure_fan(
-                enable_rpm_control=bool(rpm_control),
-                poles=int(poles),
-                edges=int(edges)
-            )
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'target_rpm': target_rpm,
+                'set_success': success
+            }
+        )
+    
+    def _fan_read_rpm(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read RPM, PWM and status from the monitoring snapshot"""
+        snapshot = self._read_device_cached('fan', device)
+        rpm = snapshot['rpm']
+        pwm = snapshot['pwm_duty_cycle']
+        status = snapshot['fan_status']
 
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'rpm_control': rpm_control,
-                    'poles': poles,
-                    'edges': edges,
-                    'configure_success': success
-                }
-            )
+        return APIResponse(
+            success=rpm is not None,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'rpm': rpm,
+                'pwm_duty_cycle': pwm,
+                'status': status
+            }
+        )
+    
+    def _fan_get_status(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Summarize fan speed for the GUI from the monitoring snapshot"""
+        snapshot = self._read_device_cached('fan', device)
+        rpm = snapshot['rpm']
+        pwm = snapshot['pwm_duty_cycle']
 
-        else:
-            return self._error_response(f"Unknown fan action: {action}", request_id)
+        # Calculate target RPM based on current PWM (rough approximation)
+        target_rpm = int((pwm / 100.0) * 3000) if pwm else 0
+
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'rpm': rpm or 0,
+                'target_rpm': target_rpm,
+                'duty_cycle': pwm or 0,
+                'failure': False  # Could be enhanced to detect actual failures
+            }
+        )
+    
+    def _fan_configure(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Set RPM control mode and tach poles/edges"""
+        rpm_control = params.get('rpm_control', True)
+        poles = params.get('poles', 2)
+        edges = params.get('edges', 1)
+
+        # Strict types: a float or string here is a client bug, not something to coerce
+        if not isinstance(rpm_control, bool):
+            return self._error_response("rpm_control must be true or false", request_id)
+        if type(poles) is not int or poles <= 0:
+            return self._error_response("poles must be a positive integer", request_id)
+        if type(edges) is not int or edges <= 0:
+            return self._error_response("edges must be a positive integer", request_id)
+
+        success = device.configure_fan(
+            enable_rpm_control=rpm_control,
+            poles=poles,
+            edges=edges
+        )
+
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'rpm_control': rpm_control,
+                'poles': poles,
+                'edges': edges,
+                'configure_success': success
+            }
+        )
     
     def _handle_eeprom_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
         """Handle EEPROM commands"""
-        
-        if action == 'read':
-            address = params.get('address', 0)
-            length = params.get('length', 1)
-            
-            if not isinstance(address, int) or not (0 <= address < device.MEMORY_SIZE):
-                return self._error_response(f"Address must be 0-{device.MEMORY_SIZE-1}", request_id)
-            
-            if not isinstance(length, int) or length <= 0:
-                return self._error_response("Length must be positive", request_id)
-            
-            data = device.read_bytes(address, length)
-            
-            return APIResponse(
-                success=data is not None,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'address': address,
-                    'length': length,
-                    'data': data,
-                    'data_hex': [f"0x{b:02X}" for b in data] if data else None
-                }
-            )
-        
-        elif action == 'write':
-            address = params.get('address', 0)
-            data = params.get('data', [])
-            
-            if not isinstance(address, int) or not (0 <= address < device.MEMORY_SIZE):
-                return self._error_response(f"Address must be 0-{device.MEMORY_SIZE-1}", request_id)
-            
+        handler = self._eeprom_actions.get(action)
+        if handler is None:
+            return self._error_response(f"Unknown EEPROM action: {action}", request_id)
+        return handler(device, params, request_id)
+    
+    def _eeprom_read(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read a byte range"""
+        address = params.get('address', 0)
+        length = params.get('length', 1)
+
+        if not isinstance(address, int) or not (0 <= address < device.MEMORY_SIZE):
+            return self._error_response(f"Address must be 0-{device.MEMORY_SIZE-1}", request_id)
+
+        if not isinstance(length, int) or length <= 0:
+            return self._error_response("Length must be positive", request_id)
+
+        # Reject ranges past the end before any bus traffic
+        if address + length > device.MEMORY_SIZE:
+            return self._error_response(f"Range exceeds memory size ({device.MEMORY_SIZE} bytes)", request_id)
+
+        data = device.read_bytes(address, length)
+
+        if not data:
+            data_hex = None
+        elif params.get('hex_format') == 'string':
+            # Opt-in: one "0A1BFF..." string, formatted in C
+            data_hex = bytes(data).hex().upper()
+        else:
+            data_hex = [_HEX_LUT[b] for b in data]
+
+        result = {'address': address, 'length': length}
+        if params.get('encoding') == 'base64':
+            # Opt-in: bytes as one base64 string instead of a list of ints;
+            # hex only on request
+            result['data_b64'] = base64.b64encode(bytes(data)).decode('ascii') if data is not None else None
+            if params.get('include_hex'):
+                result['data_hex'] = data_hex
+        else:
+            result['data'] = data
+            result['data_hex'] = data_hex
+
+        return APIResponse(
+            success=data is not None,
+            timestamp=self._now(),
+            request_id=request_id,
+            data=result
+        )
+    
+    def _eeprom_write(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Write a byte range given as a list or base64"""
+        address = params.get('address', 0)
+        data = params.get('data', [])
+        data_b64 = params.get('data_b64')
+
+        if not isinstance(address, int) or not (0 <= address < device.MEMORY_SIZE):
+            return self._error_response(f"Address must be 0-{device.MEMORY_SIZE-1}", request_id)
+
+        if data_b64 is not None:
+            # Base64 payloads decode straight to bytes
+            try:
+                payload = base64.b64decode(data_b64, validate=True)
+            except (TypeError, ValueError):
+                return self._error_response("data_b64 must be a base64 string", request_id)
+        else:
             if not isinstance(data, list):
                 return self._error_response("Data must be list of bytes", request_id)
-            
-            success = device.write_bytes(address, data)
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'address': address,
-                    'length': len(data),
-                    'write_success': success
-                }
-            )
-        
-        elif action == 'read_string':
-            address = params.get('address', 0)
-            max_length = params.get('max_length', 1024)
-            
-            text = device.read_string(address, max_length)
-            
-            return APIResponse(
-                success=text is not None,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'address': address,
-                    'text': text,
-                    'length': len(text) if text else 0
-                }
-            )
-        
-        elif action == 'write_string':
-            address = params.get('address', 0)
-            text = params.get('text', '')
-            
-            success = device.write_string(address, text)
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'address': address,
-                    'text': text,
-                    'length': len(text),
-                    'write_success': success
-                }
-            )
-        
-        elif action == 'get_info':
-            info = device.get_memory_info()
-            
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data=info
-            )
-        
-        elif action == 'test':
-            address = params.get('address', 0x1000)
-            size = params.get('size', 256)
-            
-            success = device.test_memory(address, size)
-            
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'test_address': address,
-                    'test_size': size,
-                    'test_passed': success
-                }
-            )
-        
-        else:
-            return self._error_response(f"Unknown EEPROM action: {action}", request_id)
 
-    def _handle_ai_vision_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
-        """Handle AI-Vision system commands"""
+            # Convert once in C; also rejects non-int and out-of-range values
+            try:
+                payload = bytes(data)
+            except (TypeError, ValueError):
+                return self._error_response("Data must be list of bytes (0-255)", request_id)
 
-        if action == 'get_status':
-            status = device.get_status()
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data=asdict(status)
-            )
+        if address + len(payload) > device.MEMORY_SIZE:
+            return self._error_response(f"Range exceeds memory size ({device.MEMORY_SIZE} bytes)", request_id)
 
-        elif action == 'list_cameras':
-            cameras = device.camera_manager.detect_cameras()
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'cameras': [asdict(cam) for cam in cameras]
-                }
-            )
+        success = device.write_bytes(address, payload)
+
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'address': address,
+                'length': len(payload),
+                'write_success': success
+            }
+        )
+    
+    def _eeprom_read_string(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Read a string of up to max_length bytes"""
+        address = params.get('address', 0)
+        max_length = params.get('max_length', 1024)
 
-        elif action == 'start':
-            camera_id = params.get('camera_id', 0)
-            model_name = params.get('model_name', 'yolo11n.pt')
+        text = device.read_string(address, max_length)
 
-            # Load model if different and YOLO is available
-            current_model = device.inference_engine.model_name
-            if current_model != model_name:
-                if not device.inference_engine.load_model(model_name):
-                    # Allow camera-only mode if YOLO model loading fails
-                    pass  # Continue in camera-only mode
+        return APIResponse(
+            success=text is not None,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'address': address,
+                'text': text,
+                'length': len(text) if text else 0
+            }
+        )
+    
+    def _eeprom_write_string(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Write a string"""
+        address = params.get('address', 0)
+        text = params.get('text', '')
 
-            success = device.start(camera_id)
+        success = device.write_string(address, text)
 
-            return APIResponse(
-                success=success,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={
-                    'active': device.active,
-                    'camera_id': camera_id,
-                    'model_name': model_name
-                }
-            )
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'address': address,
+                'text': text,
+                'length': len(text),
+                'write_success': success
+            }
+        )
+    
+    def _eeprom_get_info(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Report memory size and type"""
+        info = device.get_memory_info()
 
-        elif action == 'stop':
-            device.stop()
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data=info
+        )
+    
+    def _eeprom_test(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Run the driver memory test over an address range"""
+        address = params.get('address', 0x1000)
+        size = params.get('size', 256)
 
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'active': device.active}
-            )
+        success = device.test_memory(address, size)
 
-        elif action == 'set_confidence':
-            confidence = params.get('confidence', 0.5)
-            if not isinstance(confidence, (int, float)) or not (0.0 <= confidence <= 1.0):
-                return self._error_response("Confidence must be between 0.0 and 1.0", request_id)
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'test_address': address,
+                'test_size': size,
+                'test_passed': success
+            }
+        )
+    
+    def _handle_ai_vision_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
+        """Handle AI-Vision system commands"""
+        handler = self._ai_vision_actions.get(action)
+        if handler is None:
+            return self._error_response(f"Unknown AI-Vision action: {action}", request_id)
+        return handler(device, params, request_id)
+    
+    def _ai_vision_get_status(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Report camera, model and detection statistics"""
+        status = device.get_status()
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data=asdict(status)
+        )
+    
+    def _ai_vision_list_cameras(self, device, params: Dict, request_id: str) -> APIResponse:
+        """List detected cameras"""
+        cameras = device.camera_manager.detect_cameras()
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'cameras': cameras  # Dataclasses, encoded directly by the JSON layer
+            }
+        )
+    
+    def _ai_vision_start(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Start processing on a camera, switching model if a different one is requested"""
+        camera_id = params.get('camera_id', 0)
+        model_name = params.get('model_name', 'yolo11n.pt')
 
-            device.inference_engine.set_confidence_threshold(confidence)
+        # Load model if different and YOLO is available
+        current_model = device.inference_engine.model_name
+        if current_model != model_name:
+            if not device.inference_engine.load_model(model_name):
+                # Allow camera-only mode if YOLO model loading fails
+                pass  # Continue in camera-only mode
 
-            return APIResponse(
-                success=True,
-                timestamp=time.time(),
-                request_id=request_id,
-                data={'confidence_threshold': device.inference_engine.confidence_threshold}
-            )
+        success = device.start(camera_id)
 
-        elif action == 'get_frame':
-            frame_data = device.get_latest_frame()
-            if frame_data:
-                # Encode frame as base64 for JSON transport
-                frame_b64 = base64.b64encode(frame_data).decode('utf-8')
-                return APIResponse(
-                    success=True,
-                    timestamp=time.time(),
-                    request_id=request_id,
-                    data={
-                        'frame': frame_b64,
-                        'format': 'jpeg',
-                        'active': device.active
-                    }
-                )
-            else:
-                return APIResponse(
-                    success=False,
-                    timestamp=time.time(),
-                    request_id=request_id,
-                    error="No frame available"
-                )
+        return APIResponse(
+            success=success,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'active': device.active,
+                'camera_id': camera_id,
+                'model_name': model_name
+            }
+        )
+    
+    def _ai_vision_stop(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Stop processing"""
+        device.stop()
+
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'active': device.active}
+        )
+    
+    def _ai_vision_set_confidence(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Set the detection confidence threshold"""
+        confidence = params.get('confidence', 0.5)
+        if not isinstance(confidence, (int, float)) or not (0.0 <= confidence <= 1.0):
+            return self._error_response("Confidence must be between 0.0 and 1.0", request_id)
 
-        elif action == 'get_detections':
-            max_count = params.get('max_count', 10)
-            detections = device.get_recent_detections(max_count)
+        device.inference_engine.set_confidence_threshold(confidence)
 
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'confidence_threshold': device.inference_engine.confidence_threshold}
+        )
+    
+    def _ai_vision_get_frame(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Return the latest annotated frame as base64 JPEG"""
+        # Base64 for JSON transport, cached per frame by the vision system
+        frame_b64 = device.get_latest_frame_b64()
+        if frame_b64:
             return APIResponse(
                 success=True,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 request_id=request_id,
                 data={
-                    'detections': detections,
-                    'count': len(detections)
+                    'frame': frame_b64,
+                    'format': 'jpeg',
+                    'active': device.active
                 }
             )
-
-        elif action == 'get_available_models':
-            # List of common YOLO models
-            models = [
-                'yolo11n.pt',    # Nano - fastest
-                'yolo11s.pt',    # Small
-                'yolo11m.pt',    # Medium
-                'yolo11l.pt',    # Large
-                'yolo11x.pt'     # Extra Large - most accurate
-            ]
-
+        else:
             return APIResponse(
-                success=True,
-                timestamp=time.time(),
+                success=False,
+                timestamp=self._now(),
                 request_id=request_id,
-                data={'available_models': models}
+                error="No frame available"
             )
+    
+    def _ai_vision_get_detections(self, device, params: Dict, request_id: str) -> APIResponse:
+        """Return recent detections"""
+        max_count = params.get('max_count', 10)
+        detections = device.get_recent_detections(max_count)
 
-        else:
-            return self._error_response(f"Unknown AI-Vision action: {action}", request_id)
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={
+                'detections': detections,
+                'count': len(detections)
+            }
+        )
+    
+    def _ai_vision_get_available_models(self, device, params: Dict, request_id: str) -> APIResponse:
+        """List the selectable YOLO models"""
+        # List of common YOLO models
+        models = [
+            'yolo11n.pt',    # Nano - fastest
+            'yolo11s.pt',    # Small
+            'yolo11m.pt',    # Medium
+            'yolo11l.pt',    # Large
+            'yolo11x.pt'     # Extra Large - most accurate
+        ]
 
+        return APIResponse(
+            success=True,
+            timestamp=self._now(),
+            request_id=request_id,
+            data={'available_models': models}
+        )
+    
     def _handle_can_command(self, device, action: str, params: Dict, request_id: str) -> APIResponse:
         """Handle CAN interface commands"""
 
@@ -2031,7 +2776,7 @@ class HMIJsonAPI:
                 status = can_interface.get_status()
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=status
                 )
@@ -2040,7 +2785,7 @@ class HMIJsonAPI:
                 interfaces = can_interface.get_available_interfaces()
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'interfaces': interfaces}
                 )
@@ -2059,7 +2804,7 @@ class HMIJsonAPI:
                 success = can_interface.connect(config)
                 return APIResponse(
                     success=success,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={
                         'connected': success,
@@ -2075,7 +2820,7 @@ class HMIJsonAPI:
                 can_interface.disconnect()
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'connected': False}
                 )
@@ -2103,7 +2848,7 @@ class HMIJsonAPI:
                 success = can_interface.send_message(arbitration_id, data_bytes, is_extended_id)
                 return APIResponse(
                     success=success,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={
                         'sent': success,
@@ -2117,7 +2862,7 @@ class HMIJsonAPI:
                 messages = can_interface.get_messages(count)
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={
                         'messages': messages,
@@ -2129,7 +2874,7 @@ class HMIJsonAPI:
                 can_interface.clear_messages()
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'cleared': True}
                 )
@@ -2139,7 +2884,7 @@ class HMIJsonAPI:
                 result = can_interface.execute_cli_command(command)
                 return APIResponse(
                     success=result.get('success', False),
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=result
                 )
@@ -2163,7 +2908,7 @@ class HMIJsonAPI:
                 status = automation_engine.get_status()
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=status
                 )
@@ -2179,7 +2924,7 @@ class HMIJsonAPI:
                 env = automation_engine.create_environment(name, variables, base_url)
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=env.to_dict()
                 )
@@ -2188,7 +2933,7 @@ class HMIJsonAPI:
                 environments = [env.to_dict() for env in automation_engine.environments.values()]
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'environments': environments}
                 )
@@ -2201,7 +2946,7 @@ class HMIJsonAPI:
                 success = automation_engine.set_active_environment(env_id)
                 return APIResponse(
                     success=success,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'active': success}
                 )
@@ -2216,7 +2961,7 @@ class HMIJsonAPI:
                 collection = automation_engine.create_collection(name, description)
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=collection.to_dict()
                 )
@@ -2225,7 +2970,7 @@ class HMIJsonAPI:
                 collections = [col.to_dict() for col in automation_engine.collections.values()]
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'collections': collections}
                 )
@@ -2253,7 +2998,7 @@ class HMIJsonAPI:
                 success = automation_engine.add_request_to_collection(collection_id, auto_request)
                 return APIResponse(
                     success=success,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'added': success, 'request_id': auto_request.id}
                 )
@@ -2282,7 +3027,7 @@ class HMIJsonAPI:
                 response = automation_engine.execute_request(auto_request, environment)
                 return APIResponse(
                     success=response.error is None,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=response.to_dict()
                 )
@@ -2297,7 +3042,7 @@ class HMIJsonAPI:
                 results = automation_engine.run_collection(collection_id, environment_id)
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={
                         'results': [result.to_dict() for result in results],
@@ -2312,7 +3057,7 @@ class HMIJsonAPI:
                 collection = automation_engine.import_insomnia_collection(collection_data)
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=collection.to_dict()
                 )
@@ -2321,7 +3066,7 @@ class HMIJsonAPI:
                 automation_engine.clear_results()
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'cleared': True}
                 )
@@ -2335,7 +3080,7 @@ class HMIJsonAPI:
                     collection = automation_engine.collections[collection_id]
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data=collection.to_dict()
                     )
@@ -2357,7 +3102,7 @@ class HMIJsonAPI:
                 library = automation_engine.upload_json_library(name, content, library_type)
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=library.to_dict()
                 )
@@ -2366,7 +3111,7 @@ class HMIJsonAPI:
                 libraries = [lib.to_dict() for lib in automation_engine.json_libraries.values()]
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'libraries': libraries}
                 )
@@ -2380,7 +3125,7 @@ class HMIJsonAPI:
                     library = automation_engine.json_libraries[library_id]
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data=library.to_dict()
                     )
@@ -2395,7 +3140,7 @@ class HMIJsonAPI:
                 success = automation_engine.delete_json_library(library_id)
                 return APIResponse(
                     success=success,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'deleted': success}
                 )
@@ -2410,7 +3155,7 @@ class HMIJsonAPI:
                 result = automation_engine.validate_json_with_schema(schema_id, data)
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=result
                 )
@@ -2425,7 +3170,7 @@ class HMIJsonAPI:
                 result = automation_engine.generate_mock_data(template_id, variables)
                 return APIResponse(
                     success=result is not None,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={'mock_data': result} if result else None,
                     error="Failed to generate mock data" if result is None else None
@@ -2443,7 +3188,7 @@ class HMIJsonAPI:
         if self.monitoring_active:
             return APIResponse(
                 success=False,
-                timestamp=time.time(),
+                timestamp=self._now(),
                 request_id=request_id,
                 error="Monitoring already active"
             )
@@ -2451,17 +3196,31 @@ class HMIJsonAPI:
         self.monitoring_interval = params.get('interval', 1.0)
         devices_to_monitor = params.get('devices', list(self.devices.keys()))
         
+        if self._reader_pool is None:
+            self._reader_pool = ThreadPoolExecutor(
+                max_workers=len(self._device_readers), thread_name_prefix='hmi-reader'
+            )
+        
         self.monitoring_active = True
+        self._status_version += 1
+        self._monitoring_stop.clear()
+        with self._monitoring_lock:
+            self._monitoring_pending = []  # Late sample from a poll thread that outlived its join
         self.monitoring_thread = threading.Thread(
             target=self._monitoring_loop,
             args=(devices_to_monitor,),
             daemon=True
         )
+        self.monitoring_dispatch_thread = threading.Thread(
+            target=self._monitoring_dispatch_loop,
+            daemon=True
+        )
+        self.monitoring_dispatch_thread.start()
         self.monitoring_thread.start()
         
         return APIResponse(
             success=True,
-            timestamp=time.time(),
+            timestamp=self._now(),
             request_id=request_id,
             data={
                 'monitoring_active': True,
@@ -2470,131 +3229,125 @@ class HMIJsonAPI:
             }
         )
     
-    def _handle_stop_monitoring(self, request_id: str) -> APIResponse:
+    def _handle_stop_monitoring(self, request_id: str, params: Dict = None) -> APIResponse:
         """Stop continuous monitoring"""
         
-        self.monitoring_active = False
-        if self.monitoring_thread:
-            self.monitoring_thread.join(timeout=2.0)
+        self._stop_monitoring_threads()
         
         return APIResponse(
             success=True,
-            timestamp=time.time(),
+            timestamp=self._now(),
             request_id=request_id,
             data={'monitoring_active': False}
         )
     
+    def _stop_monitoring_threads(self):
+        """Stop the polling and dispatch threads"""
+        self.monitoring_active = False
+        self._status_version += 1
+        self._monitoring_stop.set()   # Interrupt the poll thread's wait
+        self._monitoring_ready.set()  # Wake the dispatch thread so it can exit
+        if self.monitoring_thread:
+            self.monitoring_thread.join(timeout=2.0)
+        if self.monitoring_dispatch_thread:
+            self.monitoring_dispatch_thread.join(timeout=2.0)
+        # A sample polled after the dispatch thread's last swap would
+        # otherwise be delivered as stale data on the next start
+        with self._monitoring_lock:
+            self._monitoring_pending = []
+    
     def _monitoring_loop(self, devices_to_monitor: List[str]):
-        """Background monitoring loop"""
+        """Background monitoring loop (I2C polling only)"""
         
-        while self.monitoring_active:
+        next_tick = time.monotonic()
+        reader_pool = self._reader_pool
+        pending = {}  # device_id -> read still running from an earlier tick
+        while not self._monitoring_stop.is_set():
             try:
                 monitoring_data = {
                     'timestamp': time.time(),
                     'devices': {}
                 }
                 
+                # Read devices concurrently so a tick costs the slowest
+                # device rather than the sum of all of them; a device whose
+                # last read is still stuck is not queued again
+                futures = {}
                 for device_id in devices_to_monitor:
-                    if device_id in self.devices:
-                        device_data = self._collect_device_data(device_id)
-                        monitoring_data['devices'][device_id] = device_data
+                    if device_id not in self.devices:
+                        continue
+                    future = pending.get(device_id)
+                    if future is None or future.done():
+                        future = reader_pool.submit(self._collect_device_data, device_id)
+                    futures[device_id] = future
                 
-                # Add to queue (remove oldest if full)
-                try:
-                    self.data_queue.put_nowait(monitoring_data)
-                except queue.Full:
-                    try:
-                        self.data_queue.get_nowait()  # Remove oldest
-                        self.data_queue.put_nowait(monitoring_data)
-                    except queue.Empty:
-                        pass
+                # One deadline for the whole tick
+                done, _ = futures_wait(futures.values(), timeout=1.0)
+                pending.clear()
+                for device_id, future in futures.items():
+                    if future in done:
+                        monitoring_data['devices'][device_id] = future.result()
+                    else:
+                        pending[device_id] = future
+                        monitoring_data['devices'][device_id] = {
+                            'type': device_id,
+                            'status': 'error',
+                            'error': 'Read timed out'
+                        }
+                
+                # Hand the sample to the dispatch thread; callbacks never block polling
+                with self._monitoring_lock:
+                    self._monitoring_pending.append(monitoring_data)
+                self._monitoring_ready.set()
+                
+                # Sleep until the next deadline so the period excludes read time
+                next_tick += self.monitoring_interval
+                remaining = next_tick - time.monotonic()
+                if remaining > 0:
+                    if self._monitoring_stop.wait(remaining):
+                        break
+                else:
+                    next_tick = time.monotonic()  # Fell behind, don't burst to catch up
+                
+            except Exception as e:
+                logger.error("Monitoring error: %s", e)
+                if self._monitoring_stop.wait(1.0):
+                    break
+                next_tick = time.monotonic()
+    
+    def _monitoring_dispatch_loop(self):
+        """Publish polled samples to the data queue and callbacks"""
+        
+        while True:
+            self._monitoring_ready.wait()
+            self._monitoring_ready.clear()
+            
+            # Swap buffers under the lock, process the filled one outside it
+            with self._monitoring_lock:
+                samples, self._monitoring_pending = self._monitoring_pending, []
+            
+            for monitoring_data in samples:
+                # Add to ring buffer (deque drops the oldest entry if full)
+                self.data_queue.append(monitoring_data)
                 
                 # Trigger callbacks
-                for callback in self.callbacks.get('monitoring_data', []):
+                for callback in self.callbacks.get('monitoring_data', ()):
                     try:
                         callback(monitoring_data)
                     except Exception as e:
-                        print(f"Callback error: {e}")
-                
-                time.sleep(self.monitoring_interval)
-                
-            except Exception as e:
-                print(f"Monitoring error: {e}")
-                time.sleep(1.0)
+                        logger.error("Callback error: %s", e)
+            
+            if not self.monitoring_active:
+                break
     
     def _collect_device_data(self, device_id: str) -> Dict:
         """Collect current data from a specific device"""
         
-        device = self.devices[device_id]
+        if device_id not in self._device_readers:
+            return {'type': device_id, 'status': 'unknown'}
         
         try:
-            if device_id == 'adc':
-                channels = []
-                for ch in range(8):
-                    # Use faster averaging for monitoring (2 samples)
-                    raw = device.read_channel_averaged(ch, samples=2)
-                    voltage = (raw / 4095.0) * device.vref
-                    channels.append({
-                        'channel': ch,
-                        'raw': raw,
-                        'voltage': voltage
-                    })
-                return {
-                    'type': 'adc',
-                    'channels': channels,
-                    'vref': device.vref,
-                    'status': 'ok'
-                }
-            
-            elif device_id == 'io':
-                pins = []
-                for pin in range(16):
-                    state = device.read_pin(pin)
-                    info = device.get_pin_info(pin)
-                    pins.append({
-                        'pin': pin,
-                        'state': state,
-                        'info': info
-                    })
-                return {
-                    'type': 'io',
-                    'pins': pins,
-                    'status': 'ok'
-                }
-            
-            elif device_id == 'rtc':
-                datetime_info = device.read_datetime()
-                return {
-                    'type': 'rtc',
-                    'datetime': datetime_info,
-                    'status': 'ok' if datetime_info else 'error'
-                }
-            
-            elif device_id == 'fan':
-                rpm = device.read_fan_rpm()
-                pwm = device.get_pwm_duty_cycle()
-                fan_status = device.get_fan_status()
-                return {
-                    'type': 'fan',
-                    'rpm': rpm,
-                    'pwm_duty_cycle': pwm,
-                    'fan_status': fan_status,
-                    'status': 'ok' if rpm is not None else 'error'
-                }
-            
-            elif device_id == 'eeprom':
-                # Just test connectivity for monitoring
-                test_byte = device._read_byte(0x0000)
-                return {
-                    'type': 'eeprom',
-                    'test_read': test_byte,
-                    'memory_size': device.MEMORY_SIZE,
-                    'status': 'ok' if test_byte is not None else 'error'
-                }
-            
-            else:
-                return {'type': device_id, 'status': 'unknown'}
-                
+            return self._read_device_cached(device_id, self.devices[device_id])
         except Exception as e:
             return {
                 'type': device_id,
@@ -2602,6 +3355,75 @@ class HMIJsonAPI:
                 'error': str(e)
             }
     
+    def _read_device_cached(self, device_id: str, device) -> Dict:
+        """Run a device reader, reusing a successful snapshot younger than the device's TTL"""
+        now = time.monotonic()
+        cached = self._device_data_cache.get(device_id)
+        if cached is not None and now - cached[0] < self._device_data_ttl.get(device_id, self._default_device_data_ttl):
+            return cached[1]
+        
+        data = self._device_readers[device_id](device)
+        if data.get('status') == 'ok':
+            self._device_data_cache[device_id] = (now, data)
+        return data
+    
+    def _read_adc_data(self, device) -> Dict:
+        # Use faster averaging for monitoring (2 samples), all channels per burst
+        raws = device.read_all_raw(samples=2)
+        voltages = _adc_raws_to_voltages(raws, device.vref)
+        # Fixed 8-channel shape, built in one pass from the raw/voltage columns
+        channels = [
+            {'channel': ch, 'raw': raw, 'voltage': voltage}
+            for ch, raw, voltage in zip(_ADC_CHANNELS, raws, voltages)
+        ]
+        out = self._device_data_templates['adc'].copy()
+        out['channels'] = channels
+        out['vref'] = device.vref
+        return out
+    
+    def _read_io_data(self, device) -> Dict:
+        states = _word_to_pin_states(device.read_all_pins_raw())
+        # Fixed 16-pin shape, built in one pass from the state column
+        pins = [
+            {'pin': pin, 'state': state, 'info': self._get_io_pin_info(device, pin)}
+            for pin, state in zip(_IO_PINS, states)
+        ]
+        out = self._device_data_templates['io'].copy()
+        out['pins'] = pins
+        return out
+    
+    def _read_rtc_data(self, device) -> Dict:
+        datetime_info = device.read_datetime()
+        out = self._device_data_templates['rtc'].copy()
+        out['datetime'] = datetime_info
+        if datetime_info:
+            out['status'] = 'ok'
+        return out
+    
+    def _read_fan_data(self, device) -> Dict:
+        # The status block read already carries the PWM and tach registers,
+        # so one call covers all three values
+        fan_status = device.get_fan_status()
+        rpm = fan_status.get('rpm')
+        pwm = fan_status.get('pwm_duty')
+        out = self._device_data_templates['fan'].copy()
+        out['rpm'] = rpm
+        out['pwm_duty_cycle'] = pwm
+        out['fan_status'] = fan_status
+        if rpm is not None:
+            out['status'] = 'ok'
+        return out
+    
+    def _read_eeprom_data(self, device) -> Dict:
+        # Just test connectivity for monitoring
+        test_byte = device._read_byte(0x0000)
+        out = self._device_data_templates['eeprom'].copy()
+        out['test_read'] = test_byte
+        out['memory_size'] = device.MEMORY_SIZE
+        if test_byte is not None:
+            out['status'] = 'ok'
+        return out
+    
     def get_monitoring_data(self, max_items: int = 1) -> List[Dict]:
         """
         Get monitoring data from queue
@@ -2613,12 +3435,12 @@ class HMIJsonAPI:
             List[Dict]: List of monitoring data
         """
         data = []
-        for _ in range(max_items):
-            try:
-                item = self.data_queue.get_nowait()
-                data.append(item)
-            except queue.Empty:
-                break
+        popleft = self.data_queue.popleft
+        try:
+            for _ in range(min(max_items, len(self.data_queue))):
+                data.append(popleft())
+        except IndexError:
+            pass  # Drained concurrently by another HTTP/WebSocket consumer
         return data
     
     def register_callback(self, event_type: str, callback: Callable):
@@ -2629,27 +3451,41 @@ class HMIJsonAPI:
             event_type (str): Event type ('monitoring_data', 'device_error', etc.)
             callback (Callable): Callback function
         """
-        if event_type not in self.callbacks:
-            self.callbacks[event_type] = []
-        self.callbacks[event_type].append(callback)
+        # Publishers iterate whatever tuple they read without locking;
+        # registration swaps in a new tuple instead of mutating it
+        with self._callbacks_lock:
+            self.callbacks[event_type] = self.callbacks.get(event_type, ()) + (callback,)
+    
+    @staticmethod
+    def _disconnect_device(device):
+        try:
+            device.disconnect()
+        except Exception as e:
+            logger.error("Error disconnecting device: %s", e)
     
     def disconnect_all(self):
         """Disconnect all devices and stop monitoring"""
         
         # Stop monitoring
-        self.monitoring_active = False
-        if self.monitoring_thread:
-            self.monitoring_thread.join(timeout=2.0)
+        self._stop_monitoring_threads()
         
-        # Disconnect devices
-        for device in self.devices.values():
-            try:
-                device.disconnect()
-            except Exception as e:
-                print(f"Error disconnecting device: {e}")
+        # Reads stuck on the bus are abandoned rather than waited for
+        if self._reader_pool is not None:
+            self._reader_pool.shutdown(wait=False, cancel_futures=True)
+            self._reader_pool = None
+
+        # Disconnect devices in parallel; shutdown takes the slowest device's time
+        devices = list(self.devices.values())
+        if devices:
+            with ThreadPoolExecutor(max_workers=len(devices), thread_name_prefix='hmi-disconnect') as pool:
+                list(pool.map(self._disconnect_device, devices))
 
         self.devices.clear()
         self.device_status.clear()
+        self._device_status_dict.clear()
+        self._io_pin_info_cache.clear()
+        self._device_data_cache.clear()
+        self._status_version += 1
 
         # Stop GPIO status indicator
         if hasattr(self, 'gpio_controller'):
@@ -2749,7 +3585,7 @@ class HMIJsonAPI:
 
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data=status_data
                     )
@@ -2783,7 +3619,7 @@ class HMIJsonAPI:
 
                             if row[8]:  # analysis_text
                                 try:
-                                    analysis_json = json.loads(row[8])
+                                    analysis_json = _json_loads(row[8])
                                     analysis_data = analysis_json
                                     summary = analysis_json.get('summary', 'No summary available')
                                 except:
@@ -2804,7 +3640,7 @@ class HMIJsonAPI:
 
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data=analyses
                     )
@@ -2845,7 +3681,7 @@ class HMIJsonAPI:
 
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data=alerts
                     )
@@ -2878,7 +3714,7 @@ class HMIJsonAPI:
 
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data=config_data
                     )
@@ -2896,7 +3732,7 @@ class HMIJsonAPI:
 
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data={
                             'message': f'Analysis completed for {len(results)} log files',
@@ -2929,7 +3765,7 @@ class HMIJsonAPI:
 
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data={'message': 'Test alert sent successfully'}
                     )
@@ -2953,7 +3789,7 @@ class HMIJsonAPI:
 
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data={
                             'ai_online': ai_online,
@@ -2965,7 +3801,7 @@ class HMIJsonAPI:
                 except Exception as e:
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data={
                             'ai_online': False,
@@ -3052,7 +3888,7 @@ Keep responses concise but informative.
                         cursor.execute("""
                             INSERT INTO chat_messages (id, timestamp, message, response, role, context)
                             VALUES (?, ?, ?, ?, ?, ?)
-                        """, (chat_id, timestamp, message, ai_response, 'user', json.dumps(context)))
+                        """, (chat_id, timestamp, message, ai_response, 'user', _json_compact(context)))
 
                     chat_message = {
                         'id': chat_id,
@@ -3108,7 +3944,7 @@ Keep responses concise but informative.
                         for row in cursor.fetchall():
                             context_data = {}
                             try:
-                                context_data = json.loads(row[5]) if row[5] else {}
+                                context_data = _json_loads(row[5]) if row[5] else {}
                             except:
                                 pass
 
@@ -3170,10 +4006,10 @@ Keep responses concise but informative.
                 audio_available = device.test_audio_device() if device else False
                 total_controls = len(device.available_controls) if device else 0
 
-                # Count different types of controls
-                volume_controls = len(device.get_volume_controls()) if device else 0
-                switch_controls = len(device.get_switch_controls()) if device else 0
-                eq_controls = len(device.get_eq_controls()) if device else 0
+                # Count different types of controls (names only, values aren't needed)
+                volume_controls = len(device.get_category_names('volume')) if device else 0
+                switch_controls = len(device.get_category_names('switch')) if device else 0
+                eq_controls = len(device.get_category_names('eq')) if device else 0
 
                 status_data = {
                     'connected': audio_available,
@@ -3183,12 +4019,12 @@ Keep responses concise but informative.
                     'volume_controls': volume_controls,
                     'switch_controls': switch_controls,
                     'eq_controls': eq_controls,
-                    'last_refresh': time.time()
+                    'last_refresh': self._now()
                 }
 
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=status_data
                 )
@@ -3202,7 +4038,7 @@ Keep responses concise but informative.
 
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=controls
                 )
@@ -3225,7 +4061,7 @@ Keep responses concise but informative.
 
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=volume_controls
                 )
@@ -3248,7 +4084,7 @@ Keep responses concise but informative.
 
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=switch_controls
                 )
@@ -3271,7 +4107,7 @@ Keep responses concise but informative.
 
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data=eq_controls
                 )
@@ -3294,7 +4130,7 @@ Keep responses concise but informative.
                     updated_value = device.get_control_value(control_name)
                     return APIResponse(
                         success=True,
-                        timestamp=time.time(),
+                        timestamp=self._now(),
                         request_id=request_id,
                         data={
                             'control_name': control_name,
@@ -3318,7 +4154,7 @@ Keep responses concise but informative.
 
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={
                         'control_name': control_name,
@@ -3336,7 +4172,7 @@ Keep responses concise but informative.
 
                 return APIResponse(
                     success=True,
-                    timestamp=time.time(),
+                    timestamp=self._now(),
                     request_id=request_id,
                     data={
                         'message': f'Refreshed audio controls, found {control_count} controls',
@@ -3351,107 +4187,158 @@ Keep responses concise but informative.
             return self._error_response(f"Audio command failed: {str(e)}", request_id)
 
     def _error_response(self, message: str, request_id: str = None) -> APIResponse:
-        """Create error response"""
-        return APIResponse(
-            success=False,
-            timestamp=time.time(),
-            request_id=request_id,
-            error=message
+        """
+        Create error response
+        
+        Carries its JSON text from _ERROR_TEMPLATE, so process_json_command
+        does not encode it again.
+        """
+        timestamp = self._now()
+        return SerializedResponse(
+            _ERROR_TEMPLATE % (repr(timestamp), _json_scalar(request_id), _json_scalar(message)),
+            success=False, timestamp=timestamp, request_id=request_id, error=message
         )
 
 # Convenience functions for common operations
 
-def create_api_server(host='localhost', port=8080, hmi_api=None):
-    """
-    Create a simple HTTP server for the JSON API
-    Requires Flask: pip install flask flask-cors
-    """
-    try:
-        from flask import Flask, request, jsonify
-        from flask_cors import CORS
-    except ImportError:
-        raise ImportError("Flask and flask-cors required for API server. Install with: pip install flask flask-cors")
-    
-    if hmi_api is None:
-        hmi_api = HMIJsonAPI()
-    
-    app = Flask(__name__)
-    CORS(app)  # Enable CORS for web interfaces
-    
-    @app.route('/api/command', methods=['POST'])
+# HTTP routes, defined once at import time and bound to an app in create_api_server
+try:
+    from flask import Blueprint, Response, current_app, request
+    FLASK_AVAILABLE = True
+except ImportError:
+    FLASK_AVAILABLE = False
+
+if FLASK_AVAILABLE:
+    api_bp = Blueprint('hmi_api', __name__)
+
+    # Multipart boundary and headers preceding each MJPEG frame
+    _MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+
+    def _json_response(payload, status=200):
+        """Wrap an already-encoded JSON body without re-serializing it"""
+        return Response(payload, status=status, mimetype='application/json')
+
+    @api_bp.route('/command', methods=['POST'])
     def handle_command():
         try:
-            json_command = request.get_json()
-            if isinstance(json_command, dict):
-                json_command = json.dumps(json_command)
-            
-            response = hmi_api.process_json_command(json_command)
-            return jsonify(json.loads(response))
+            # Hand the raw body straight to the API; it parses and reports
+            # malformed JSON itself and returns the encoded response
+            response = current_app.config['HMI_API'].process_json_command_bytes(request.get_data())
+            return _json_response(response)
         except Exception as e:
-            return jsonify({
+            return _json_response(_json_compact_bytes({
                 'success': False,
                 'error': str(e),
                 'timestamp': time.time()
-            }), 500
-    
-    @app.route('/api/monitoring/data', methods=['GET'])
+            }), 500)
+
+    @api_bp.route('/monitoring/data', methods=['GET'])
     def get_monitoring_data():
         max_items = request.args.get('max_items', 10, type=int)
-        data = hmi_api.get_monitoring_data(max_items)
-        return jsonify({
+        data = current_app.config['HMI_API'].get_monitoring_data(max_items)
+
+        # Newline-delimited records on request, so clients can parse
+        # samples incrementally instead of waiting for the whole envelope
+        if (request.args.get('format') == 'ndjson'
+                or 'application/x-ndjson' in request.headers.get('Accept', '')):
+            def generate_records():
+                for item in data:
+                    yield _json_line_bytes(item)
+            return Response(generate_records(), mimetype='application/x-ndjson')
+
+        return _json_response(_json_compact_bytes({
             'success': True,
             'timestamp': time.time(),
             'data': data
-        })
-    
-    @app.route('/api/status', methods=['GET'])
-    def get_status():
-        status_command = json.dumps({'action': 'get_system_status'})
-        response = hmi_api.process_json_command(status_command)
-        return jsonify(json.loads(response))
+        }))
 
-    @app.route('/api/ai_vision/stream')
+    @api_bp.route('/status', methods=['GET'])
+    def get_status():
+        hmi_api = current_app.config['HMI_API']
+        # Read the validator before the body: a change in between only
+        # costs the client one extra full response later
+        etag = hmi_api.get_system_status_etag()
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=304, headers={'ETag': etag})
+
+        response = _json_response(hmi_api.process_json_command_bytes(b'{"action": "get_system_status"}'))
+        response.headers['ETag'] = etag
+        return response
+
+    @api_bp.route('/ai_vision/stream')
     def video_stream():
         """Video streaming endpoint for AI-Vision"""
-        def generate_frames():
-            while True:
-                if hmi_api.ai_vision and hmi_api.ai_vision.active:
-                    frame_data = hmi_api.ai_vision.get_latest_frame()
-                    if frame_data:
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + frame_data + b'\r\n')
-                    else:
-                        time.sleep(0.1)
-                else:
-                    time.sleep(0.5)
+        ai_vision = current_app.config['HMI_API'].ai_vision
+
+        # Nothing to stream: fail fast instead of parking a worker thread;
+        # clients reconnect once 'start' succeeds
+        if not ai_vision or not ai_vision.active:
+            return _json_response(_json_compact_bytes({
+                'success': False,
+                'timestamp': time.time(),
+                'error': 'AI-Vision is not active'
+            }), status=503)
 
-        return app.response_class(
+        def generate_frames():
+            last_seq = 0
+            # Ends the response when processing stops
+            while ai_vision.active:
+                # Sleep until the capture thread stores a new frame, so each
+                # frame goes out once and as soon as it exists
+                seq = ai_vision.wait_for_frame(last_seq, timeout=1.0)
+                if seq == last_seq:
+                    continue
+                last_seq = seq
+                frame_data = ai_vision.get_latest_frame()
+                if frame_data:
+                    # One part per yield; join copies the JPEG once where
+                    # chained + copied it twice
+                    yield b''.join((_MJPEG_PART_HEADER, frame_data, b'\r\n'))
+
+        return Response(
             generate_frames(),
             mimetype='multipart/x-mixed-replace; boundary=frame'
         )
 
-    @app.route('/api/ai_vision/frame')
+    @api_bp.route('/ai_vision/frame')
     def get_frame():
         """Get single frame as base64-encoded JPEG"""
-        import base64
-
+        hmi_api = current_app.config['HMI_API']
         if hmi_api.ai_vision and hmi_api.ai_vision.active:
-            frame_data = hmi_api.ai_vision.get_latest_frame()
-            if frame_data:
-                # Encode frame data as base64
-                frame_base64 = base64.b64encode(frame_data).decode('utf-8')
-                return jsonify({
+            # Encoded once per captured frame, however often clients poll
+            frame_base64 = hmi_api.ai_vision.get_latest_frame_b64()
+            if frame_base64:
+                return _json_response(_json_compact_bytes({
                     'success': True,
                     'timestamp': time.time(),
                     'frame': frame_base64,
                     'format': 'jpeg'
-                })
+                }))
 
-        return jsonify({
+        return _json_response(_json_compact_bytes({
             'success': False,
             'timestamp': time.time(),
             'error': 'No frame available'
-        })
+        }))
+
+def create_api_server(host='localhost', port=8080, hmi_api=None):
+    """
+    Create a simple HTTP server for the JSON API
+    Requires Flask: pip install flask flask-cors
+    """
+    try:
+        from flask import Flask
+        from flask_cors import CORS
+    except ImportError:
+        raise ImportError("Flask and flask-cors required for API server. Install with: pip install flask flask-cors")
+    
+    if hmi_api is None:
+        hmi_api = HMIJsonAPI()
+    
+    app = Flask(__name__)
+    CORS(app)  # Enable CORS for web interfaces
+    app.config['HMI_API'] = hmi_api
+    app.register_blueprint(api_bp, url_prefix='/api')
 
     # Setup signal handlers for graceful shutdown
     def signal_handler(signum, frame):
@@ -3469,7 +4356,9 @@ def create_api_server(host='localhost', port=8080, hmi_api=None):
     print(f"Starting HMI API server on http://{host}:{port}")
 
     try:
-        app.run(host=host, port=port, debug=False)
+        # Threaded Werkzeug lets slow device reads overlap other requests
+        # while HMIJsonAPI and its threads stay in this one process
+        app.run(host=host, port=port, debug=False, threaded=True)
     finally:
         # Cleanup on shutdown
         print("Shutting down HMI API server...")
@@ -3481,56 +4370,118 @@ def create_websocket_server(host='localhost', port=8081, hmi_api=None):
     Requires websockets: pip install websockets
     """
     try:
-        import asyncio
         import websockets
-        import json
     except ImportError:
         raise ImportError("websockets required for WebSocket server. Install with: pip install websockets")
     
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # Default asyncio event loop
+    
     if hmi_api is None:
         hmi_api = HMIJsonAPI()
     
-    async def handle_client(websocket, path):
+    # Monitoring samples are coalesced and pushed on a timer instead of
+    # one frame per sample, and encoded once per wire format for all clients
+    MONITORING_FLUSH_INTERVAL = 0.2
+    MONITORING_BATCH_SIZE = 64
+    BROADCAST_CHUNK = 50
+    json_clients = set()
+    msgpack_clients = set()
+    
+    def wants_msgpack(websocket, path):
+        """Clients opt into binary frames with ?format=msgpack"""
+        if path is None:
+            request = getattr(websocket, 'request', None)
+            path = getattr(request, 'path', None) or getattr(websocket, 'path', '')
+        query = parse_qs(urlsplit(path).query)
+        return MSGPACK_AVAILABLE and query.get('format', [''])[0] == 'msgpack'
+    
+    async def broadcast(clients, message):
+        """Send one pre-encoded message to every client in the set"""
+        if not clients:
+            return
+        if hasattr(websockets, 'broadcast'):
+            # Writes to each connection without awaiting per-client sends
+            websockets.broadcast(clients, message)
+            return
+        for index, client in enumerate(list(clients)):
+            try:
+                await client.send(message)
+            except websockets.exceptions.ConnectionClosed:
+                clients.discard(client)
+            if index % BROADCAST_CHUNK == BROADCAST_CHUNK - 1:
+                await asyncio.sleep(0)
+    
+    async def flush_monitoring():
+        """Drain queued monitoring samples and broadcast them once per tick"""
+        while True:
+            # Leave samples queued for HTTP polling when nobody is listening
+            if json_clients or msgpack_clients:
+                try:
+                    batch = hmi_api.get_monitoring_data(MONITORING_BATCH_SIZE)
+                    if batch:
+                        message = {
+                            'type': 'monitoring_batch',
+                            'timestamp': time.time(),
+                            'data': batch
+                        }
+                        await broadcast(json_clients, _json_compact(message))
+                        if msgpack_clients:
+                            await broadcast(msgpack_clients, _msgpack_dumps(message))
+                except Exception as e:
+                    # A bad batch is dropped; the server keeps running
+                    logger.error("Monitoring broadcast error: %s", e)
+            await asyncio.sleep(MONITORING_FLUSH_INTERVAL)
+    
+    async def handle_client(websocket, path=None):
         print(f"Client connected: {websocket.remote_address}")
+        use_msgpack = wants_msgpack(websocket, path)
+        if use_msgpack:
+            process_command, encode = hmi_api.process_json_command_msgpack, _msgpack_dumps
+            clients = msgpack_clients
+        else:
+            process_command, encode = hmi_api.process_json_command, _json_compact
+            clients = json_clients
+        clients.add(websocket)
         
         try:
             async for message in websocket:
                 try:
-                    # Process command
-                    response = hmi_api.process_json_command(message)
+                    # Device commands block on the bus (EEPROM tests, storage
+                    # benchmarks take seconds), so run them off the event loop
+                    # to keep other clients and the monitoring flush moving
+                    response = await asyncio.to_thread(process_command, message)
                     await websocket.send(response)
                     
-                    # Send monitoring data if available
-                    monitoring_data = hmi_api.get_monitoring_data(1)
-                    if monitoring_data:
-                        monitoring_response = {
-                            'type': 'monitoring_data',
-                            'timestamp': time.time(),
-                            'data': monitoring_data[0]
-                        }
-                        await websocket.send(json.dumps(monitoring_response))
-                        
                 except Exception as e:
                     error_response = {
                         'success': False,
                         'error': str(e),
                         'timestamp': time.time()
                     }
-                    await websocket.send(json.dumps(error_response))
+                    await websocket.send(encode(error_response))
                     
         except websockets.exceptions.ConnectionClosed:
             print(f"Client disconnected: {websocket.remote_address}")
+        finally:
+            clients.discard(websocket)
     
-    print(f"Starting HMI WebSocket server on ws://{host}:{port}")
-    start_server = websockets.serve(handle_client, host, port)
+    async def serve():
+        async with websockets.serve(handle_client, host, port):
+            await flush_monitoring()
     
-    asyncio.get_event_loop().run_until_complete(start_server)
-    asyncio.get_event_loop().run_forever()
+    print(f"Starting HMI WebSocket server on ws://{host}:{port}")
+    asyncio.run(serve())
 
 if __name__ == "__main__":
     # Example usage
     import sys
     
+    _start_log_listener()
+    
     # Create HMI API instance
     hmi = HMIJsonAPI()
     
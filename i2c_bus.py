@@ -0,0 +1,13 @@
+"""
+Shared I2C bus import
+Resolves the smbus2/smbus fallback once per process for all device drivers
+"""
+
+try:
+    import smbus2 as smbus
+    from smbus2 import i2c_msg
+except ImportError:
+    import smbus
+    i2c_msg = None  # Combined transactions need smbus2
+
+SMBus = smbus.SMBus
@@ -1,9 +1,8 @@
-try:
-    import smbus2 as smbus
-except ImportError:
-    import smbus
+from i2c_bus import SMBus
 
 class PCAL9555A:
+    REG_INPUT_PORT0 = 0x00  # Input Port 0, Input Port 1 follows at 0x01
+
     def __init__(self, bus_number=10, address=0x24):
         self.bus_number = bus_number
         self.address = address
@@ -11,7 +10,7 @@ class PCAL9555A:
         
     def connect(self):
         try:
-            self.bus = smbus.SMBus(self.bus_number)
+            self.bus = SMBus(self.bus_number)
             self.bus.read_byte(self.address)
             print(f"PCAL9555A connected at 0x{self.address:02X}")
             return True
@@ -19,8 +18,19 @@ class PCAL9555A:
             print(f"PCAL9555A connection failed: {e}")
             return False
     
+    def read_all_pins_raw(self):
+        """Read both input ports in one transaction as a 16-bit word (bit n = pin n)"""
+        if self.bus is None:
+            return 0
+        try:
+            port0, port1 = self.bus.read_i2c_block_data(self.address, self.REG_INPUT_PORT0, 2)
+            return port0 | (port1 << 8)
+        except Exception as e:
+            print(f"Error reading input ports: {e}")
+            return 0
+    
     def read_pin(self, pin):
-        return 0
+        return (self.read_all_pins_raw() >> pin) & 1
     
     def write_pin(self, pin, state):
         return True
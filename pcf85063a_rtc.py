@@ -1,7 +1,4 @@
-try:
-    import smbus2 as smbus
-except ImportError:
-    import smbus
+from i2c_bus import SMBus
 from datetime import datetime
 
 class PCF85063A:
@@ -12,7 +9,7 @@ class PCF85063A:
         
     def connect(self):
         try:
-            self.bus = smbus.SMBus(self.bus_number)
+            self.bus = SMBus(self.bus_number)
             self.bus.read_byte(self.address)
             print(f"PCF85063A connected at 0x{self.address:02X}")
             return True
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for ADC data logging
+Runs without hardware: rows are fed to ADCDataLogger directly
+"""
+
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime
+from hmi_json_api import (ADCDataLogger, ADCDataPoint, ChannelRing, LoggingConfig, ADC_LOG_MAGIC, ADC_LOG_RECORD,
+                          iter_binary_adc_log, convert_binary_adc_log)
+
+# (timestamp, channel, raw_value, voltage, vref); values exact in float32
+ROWS = [
+    (1700000000.0 + i * 0.5, channel, 512 * channel + i, 0.25 * channel + 0.125, 3.25)
+    for i in range(4)
+    for channel in range(3)
+]
+
+def _write_binary_log(directory: str) -> str:
+    """Write ROWS through the logger's batch writer and return the file path"""
+    logger = ADCDataLogger(LoggingConfig(enabled=True, log_directory=directory, file_format='binary'))
+    logger._check_log_rotation()
+    path = logger.current_log_file.name
+    logger._write_batch(ROWS)
+    logger._close_log_file()
+    return path
+
+def test_binary_log_round_trip():
+    """Rows written in binary format read back unchanged"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write_binary_log(directory)
+        assert path.endswith('.bin')
+        with open(path, 'rb') as f:
+            assert f.read(len(ADC_LOG_MAGIC)) == ADC_LOG_MAGIC
+        assert os.path.getsize(path) == len(ADC_LOG_MAGIC) + len(ROWS) * ADC_LOG_RECORD.size
+        assert list(iter_binary_adc_log(path)) == ROWS
+
+def test_binary_log_truncated_record():
+    """A partial record at the end of the file (e.g. after power loss) is skipped"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write_binary_log(directory)
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - ADC_LOG_RECORD.size // 2)
+        assert list(iter_binary_adc_log(path)) == ROWS[:-1]
+
+def test_binary_log_bad_magic():
+    """Files without the magic header are rejected"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'adc_data.bin')
+        with open(path, 'wb') as f:
+            f.write(ADCDataLogger.CSV_HEADER)
+        try:
+            list(iter_binary_adc_log(path))
+        except ValueError:
+            return
+        raise AssertionError("CSV file accepted as a binary log")
+
+def test_convert_binary_log_to_csv():
+    """Converted logs have the same layout as CSV log files"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write_binary_log(directory)
+        csv_path = os.path.join(directory, 'converted.csv')
+        assert convert_binary_adc_log(path, csv_path) == len(ROWS)
+
+        csv_logger = ADCDataLogger(LoggingConfig(enabled=True, log_directory=os.path.join(directory, 'csv')))
+        csv_logger._check_log_rotation()
+        expected_path = csv_logger.current_log_file.name
+        csv_logger._write_batch(ROWS)
+        csv_logger._close_log_file()
+
+        with open(csv_path, 'rb') as converted, open(expected_path, 'rb') as expected:
+            assert converted.read() == expected.read()
+
+def test_channel_ring_rows():
+    """Ring rows match a plain list of the newest samples, across wrap-around"""
+    capacity = 5
+    ring = ChannelRing(capacity)
+    samples = []
+    assert ring.rows() == []
+    for i in range(12):
+        sample = (100.0 + i, i, i * 0.5, 3.3)
+        ring.append(*sample)
+        samples.append(sample)
+        kept = samples[-capacity:]
+        assert len(ring) == len(kept)
+        assert ring.rows() == kept
+        for max_points in range(1, capacity + 2):
+            assert ring.rows(max_points) == kept[-max_points:]
+        for since in (0.0, 100.0 + i - 2, 100.0 + i - 1.5, 100.0 + i + 1):
+            assert ring.rows(since=since) == [row for row in kept if row[0] >= since]
+        assert ring.rows(2, since=100.0 + i - 3) == [row for row in kept if row[0] >= 100.0 + i - 3][-2:]
+
+def test_export_data_csv():
+    """Export merges channels in time order, same text as csv.writer over a sorted list"""
+    logger = ADCDataLogger(LoggingConfig(enabled=True, max_memory_points=50))
+    points = []
+    for i in range(40):
+        # Channels sampled at staggered times, with some shared timestamps
+        for channel, offset in ((0, 0.0), (1, 0.3), (2, 0.0 if i % 3 else 0.6)):
+            point = ADCDataPoint(1700000000.0 + i + offset, channel, i * 7 + channel, i * 0.01 + channel, 3.3)
+            logger.log_adc_reading(point)
+            points.append(point)
+
+    expected = io.StringIO(newline='')
+    writer = csv.writer(expected)
+    writer.writerow(['timestamp', 'datetime', 'channel', 'raw_value', 'voltage', 'vref'])
+    for p in sorted(points, key=lambda p: p.timestamp):
+        writer.writerow([p.timestamp, datetime.fromtimestamp(p.timestamp).isoformat(),
+                         p.channel, p.raw_value, p.voltage, p.vref])
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'export.csv')
+        assert logger.export_data_csv(path)
+        with open(path, 'rb') as f:
+            assert f.read() == expected.getvalue().encode()
+
+        # Single channel export keeps only that channel's rows
+        assert logger.export_data_csv(path, channel=1)
+        with open(path, newline='') as f:
+            rows = list(csv.reader(f))[1:]
+        assert [int(row[2]) for row in rows] == [1] * 40
+        assert [float(row[0]) for row in rows] == sorted(p.timestamp for p in points if p.channel == 1)
+
+if __name__ == "__main__":
+    test_binary_log_round_trip()
+    test_binary_log_truncated_record()
+    test_binary_log_bad_magic()
+    test_convert_binary_log_to_csv()
+    test_channel_ring_rows()
+    test_export_data_csv()
+    print("ADC logging tests passed")
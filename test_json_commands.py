@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for HMI JSON command processing
+Runs without hardware: HMIJsonAPI is created with auto_connect=False
+"""
+
+import json
+import time
+import msgpack
+import hmi_json_api
+from hmi_json_api import ADCDataPoint, HMIJsonAPI
+
+def _failing_dumps(obj):
+    raise TypeError("payload not serializable")
+
+def test_encoder_failure_returns_error_json():
+    """An encoder failure still yields a JSON error from every process_json_command variant"""
+    api = HMIJsonAPI(auto_connect=False)
+    command = '{"action": "get_device_list"}'
+    saved = hmi_json_api._json_dumps, hmi_json_api._json_dumps_bytes
+    hmi_json_api._json_dumps = hmi_json_api._json_dumps_bytes = _failing_dumps
+    try:
+        text = api.process_json_command(command)
+        raw = api.process_json_command_bytes(command)
+    finally:
+        hmi_json_api._json_dumps, hmi_json_api._json_dumps_bytes = saved
+
+    assert isinstance(text, str) and isinstance(raw, bytes)
+    for response in (json.loads(text), json.loads(raw)):
+        assert response['success'] is False
+        assert response['error'] == "Unexpected error: payload not serializable"
+
+def test_logged_data_columns_layout():
+    """layout='columns' decodes to an object on every wire format"""
+    api = HMIJsonAPI(auto_connect=False)
+    api.devices['adc'] = object()  # Logged data comes from memory, not the device
+    api.adc_logger.set_enabled(True)
+    for i in range(3):
+        api.adc_logger.log_adc_reading(ADCDataPoint(1700000000.0 + i, 0, 100 + i, 0.5 + i, 3.3))
+
+    command = json.dumps({'action': 'get_logged_data', 'device': 'adc', 'request_id': 'cols',
+                          'params': {'layout': 'columns', 'channel': 0}})
+    responses = [
+        json.loads(api.process_json_command(command)),
+        json.loads(api.process_json_command_bytes(command)),
+        msgpack.unpackb(api.process_json_command_msgpack(command), strict_map_key=False),
+    ]
+    for response in responses:
+        assert isinstance(response, dict), response
+        assert response['success'] is True and response['request_id'] == 'cols'
+        channel = response['data']['logged_data']['0']
+        assert list(channel['raw']) == [100, 101, 102]
+        assert list(channel['ts']) == [1700000000.0, 1700000001.0, 1700000002.0]
+
+def test_cached_status_request_ids():
+    """Status polls answered from the cache each get their own request_id"""
+    api = HMIJsonAPI(auto_connect=False)
+    command = '{"action": "get_system_status"}'
+    first, second = (json.loads(api.process_json_command(command)) for _ in range(2))
+    assert first['timestamp'] == second['timestamp']  # Same cached body
+    assert first['request_id'] != second['request_id']
+    packed = msgpack.unpackb(api.process_json_command_msgpack(command), strict_map_key=False)
+    assert packed['request_id'] not in (first['request_id'], second['request_id'])
+
+class _FakeDevice:
+    def __init__(self):
+        self.disconnects = 0
+
+    def disconnect(self):
+        self.disconnects += 1
+
+def test_monitoring_after_disconnect_all():
+    """Monitoring restarts cleanly after disconnect_all, which can run more than once"""
+    api = HMIJsonAPI(auto_connect=False)
+    api._collect_device_data = lambda device_id: {'type': device_id, 'status': 'ok'}
+
+    for _ in range(2):
+        device = _FakeDevice()
+        api.devices['adc'] = device
+        response = json.loads(api.process_json_command(
+            '{"action": "start_monitoring", "params": {"interval": 0.05, "devices": ["adc"]}}'))
+        assert response['success'] is True
+        time.sleep(0.3)
+        samples = api.get_monitoring_data(100)
+        assert samples and all(sample['devices']['adc']['status'] == 'ok' for sample in samples)
+
+        api.disconnect_all()
+        assert device.disconnects == 1
+        api.devices['adc'] = device
+        api.disconnect_all()
+        assert device.disconnects == 2
+
+def test_stop_monitoring_drops_pending_samples():
+    """A sample still pending when monitoring stops is not delivered after a restart"""
+    api = HMIJsonAPI(auto_connect=False)
+    api._collect_device_data = lambda device_id: {'type': device_id, 'status': 'ok'}
+    api.devices['adc'] = _FakeDevice()
+    api._monitoring_pending.append({'timestamp': 0.0, 'devices': {}, 'stale': True})
+    api.process_json_command('{"action": "stop_monitoring"}')
+
+    api.process_json_command('{"action": "start_monitoring", "params": {"interval": 0.05, "devices": ["adc"]}}')
+    time.sleep(0.2)
+    api.process_json_command('{"action": "stop_monitoring"}')
+    samples = api.get_monitoring_data(100)
+    assert samples and not any(sample.get('stale') for sample in samples)
+
+if __name__ == "__main__":
+    test_encoder_failure_returns_error_json()
+    test_logged_data_columns_layout()
+    test_monitoring_after_disconnect_all()
+    test_cached_status_request_ids()
+    test_stop_monitoring_drops_pending_samples()
+    print("JSON command tests passed")
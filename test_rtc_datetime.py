@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for RTC set_datetime string parsing
+Checks the regex fast path against the ISO parser it replaces
+"""
+
+from datetime import datetime
+from hmi_json_api import _parse_datetime_fields
+
+VALID = [
+    '2024-02-29T10:00:00',
+    '2024-12-31 23:59:59',
+    '2024-01-01T10:00:00.250',
+    '2024-01-01T10:00:00Z',
+    '2024-01-01T10:00:00+02:00',
+]
+
+INVALID = [
+    '2024-02-30T10:00:00',      # Day past the end of February
+    '2023-02-29 00:00:00',      # Not a leap year
+    '2024-04-31T12:00:00',
+    '2024-13-01T00:00:00',
+    '2024-01-01T24:00:00',
+    '2024-01-01T10:00:00junk',  # Trailing garbage
+    'not a date',
+]
+
+def test_valid_datetimes():
+    """Accepted strings give the same fields as datetime.fromisoformat"""
+    for value in VALID:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        expected = (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+        assert _parse_datetime_fields(value) == expected, value
+
+def test_invalid_datetimes():
+    """Impossible or malformed dates raise ValueError, also on a repeated (cached) call"""
+    for value in INVALID:
+        for _ in range(2):
+            try:
+                fields = _parse_datetime_fields(value)
+            except ValueError:
+                continue
+            raise AssertionError(f"{value!r} accepted as {fields}")
+
+if __name__ == "__main__":
+    test_valid_datetimes()
+    test_invalid_datetimes()
+    print("RTC datetime parsing tests passed")